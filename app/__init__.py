@@ -1,5 +1,13 @@
 """Joint Space Visualizer application package."""
 
-from app.ui import JointSpaceVisualizerApp
-
 __all__ = ["JointSpaceVisualizerApp"]
+
+
+def __getattr__(name):
+    # Imported lazily so Qt-free entry points (service worker processes) can
+    # import ``app.services`` without pulling in PyQt5.
+    if name == "JointSpaceVisualizerApp":
+        from app.ui import JointSpaceVisualizerApp
+
+        return JointSpaceVisualizerApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,322 @@
+"""Headless batch processing of target/source mesh pairs.
+
+Usage::
+
+    python -m app.batch --manifest pairs.csv --output results/
+    python -m app.batch --dirs "study/*" --target "*maxilla*" --source "*mandible*" --output results/
+
+Each pair produces ``<name>_distance.vtp`` and ``<name>_colored.ply`` in the
+output directory, and ``summary.csv`` there lists the minimum distance and
+stage timings of every pair.  Outputs are written under temporary names and
+renamed when complete, so a rerun after an interruption skips the pairs
+whose outputs already exist.
+"""
+
+import argparse
+import csv
+import glob
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+if __package__ is None or __package__ == '':
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.env_utils import prepare_runtime_dirs
+
+prepare_runtime_dirs()
+
+from app.logging_config import configure_logging
+from app.services import (
+    COLORMAP_MAX_DISTANCE,
+    DECIMATION_METHODS,
+    DEFAULT_DECIMATION_METHOD,
+    DEFAULT_DISTANCE_ENGINE,
+    DISTANCE_ENGINES,
+    MeshOperationError,
+    compute_distance,
+    compute_distance_in_roi,
+    distance_colormap,
+    load_mesh,
+    save_colored_mesh,
+    save_mesh,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FILE_NAME = "summary.csv"
+SUMMARY_FIELDS = (
+    "name",
+    "target",
+    "source",
+    "status",
+    "min_distance",
+    "source_points",
+    "result_points",
+    "load_seconds",
+    "compute_seconds",
+    "save_seconds",
+    "error",
+)
+
+
+def output_paths(output_dir: Path, name: str):
+    return output_dir / f"{name}_distance.vtp", output_dir / f"{name}_colored.ply"
+
+
+def read_manifest(path: Path):
+    """Pairs from a CSV with ``target`` and ``source`` columns and an optional ``name``."""
+    base = path.parent
+    pairs = []
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            if not row.get("target") or not row.get("source"):
+                raise ValueError(f"{path}: every row needs target and source columns")
+            target = base / row["target"]
+            source = base / row["source"]
+            name = row.get("name") or source.stem
+            pairs.append((name, target, source))
+    return pairs
+
+
+def find_pairs(dir_pattern: str, target_pattern: str, source_pattern: str):
+    """One pair per directory matching ``dir_pattern``, named after the directory."""
+    pairs = []
+    for directory in sorted(Path(path) for path in glob.glob(dir_pattern)):
+        if not directory.is_dir():
+            continue
+        targets = sorted(directory.glob(target_pattern))
+        sources = sorted(directory.glob(source_pattern))
+        if len(targets) != 1 or len(sources) != 1:
+            logger.warning(
+                "Skipping %s: expected one target and one source, found %d and %d",
+                directory,
+                len(targets),
+                len(sources),
+            )
+            continue
+        pairs.append((directory.name, targets[0], sources[0]))
+    return pairs
+
+
+def process_pair(name, target_path, source_path, output_dir, options):
+    """Load, compute and save one pair; returns a summary row."""
+    row = {"name": name, "target": str(target_path), "source": str(source_path)}
+    distance_path, colored_path = output_paths(Path(output_dir), name)
+    # Temporary names keep half-written files from counting as finished.
+    colored_tmp = colored_path.with_name(f".{colored_path.stem}.tmp.ply")
+    distance_tmp = distance_path.with_name(f".{distance_path.stem}.tmp.vtp")
+    options = dict(options)
+    roi = options.pop("roi", False)
+    try:
+        started = time.perf_counter()
+        target = load_mesh(str(target_path))
+        source = load_mesh(str(source_path))
+        row["load_seconds"] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        if roi:
+            result, min_distance = compute_distance_in_roi(source, target, **options)
+        else:
+            result, min_distance = compute_distance(source, target, **options)
+        row["compute_seconds"] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        save_colored_mesh(result, distance_colormap(), str(colored_tmp))
+        save_mesh(result, str(distance_tmp))
+        os.replace(colored_tmp, colored_path)
+        os.replace(distance_tmp, distance_path)
+        row["save_seconds"] = round(time.perf_counter() - started, 3)
+    except (MeshOperationError, OSError) as exc:
+        logger.error("Pair %s failed: %s", name, exc)
+        row.update(status="failed", error=str(exc))
+        return row
+    except Exception as exc:
+        logger.error("Pair %s failed unexpectedly", name, exc_info=True)
+        row.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+        return row
+    finally:
+        if row.get("status") == "failed":
+            for path in (colored_tmp, distance_tmp):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    logger.warning("Could not remove %s", path, exc_info=True)
+
+    row.update(
+        status="done",
+        min_distance="" if min_distance is None else round(min_distance, 6),
+        source_points=source.n_points,
+        result_points=result.n_points,
+    )
+    return row
+
+
+def _configure_worker_logging() -> None:
+    """Pool workers log to stderr; only the parent writes (and rotates) app.log."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(processName)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+
+
+def load_summary(path: Path):
+    if not path.exists():
+        return {}
+    with path.open(newline="", encoding="utf-8") as handle:
+        return {row["name"]: row for row in csv.DictReader(handle)}
+
+
+def write_summary(path: Path, rows) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    os.replace(tmp, path)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.batch",
+        description="Compute joint-space distance maps for many target/source pairs.",
+    )
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--manifest", type=Path, help="CSV with name,target,source columns")
+    inputs.add_argument("--dirs", help="glob of per-pair directories, e.g. 'study/*'")
+    parser.add_argument("--target", default="*maxilla*", help="target file glob inside each directory")
+    parser.add_argument("--source", default="*mandible*", help="source file glob inside each directory")
+    parser.add_argument("--output", type=Path, required=True, help="output directory")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="pairs processed in parallel (default: half the CPUs)",
+    )
+    parser.add_argument("--engine", choices=DISTANCE_ENGINES, default=DEFAULT_DISTANCE_ENGINE)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="KD-tree processes per pair (default: serial)"
+    )
+    decimation = parser.add_mutually_exclusive_group()
+    decimation.add_argument("--reduction", type=float, help="decimation ratio, e.g. 0.5")
+    decimation.add_argument("--target-points", type=int, help="decimate to this many vertices")
+    parser.add_argument(
+        "--decimation-method", choices=DECIMATION_METHODS, default=DEFAULT_DECIMATION_METHOD
+    )
+    parser.add_argument(
+        "--bounded",
+        action="store_true",
+        help=f"clamp distances at {COLORMAP_MAX_DISTANCE:g} mm and skip far vertices",
+    )
+    parser.add_argument("--roi", action="store_true", help="crop both meshes to their overlap first")
+    parser.add_argument("--force", action="store_true", help="recompute pairs whose outputs exist")
+    return parser
+
+
+def main(argv=None) -> int:
+    configure_logging()
+    args = build_parser().parse_args(argv)
+
+    try:
+        if args.manifest is not None:
+            pairs = read_manifest(args.manifest)
+        else:
+            pairs = find_pairs(args.dirs, args.target, args.source)
+    except (OSError, ValueError) as exc:
+        logger.error("Cannot read pairs: %s", exc)
+        return 2
+    names = [name for name, _, _ in pairs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        logger.error("Duplicate pair names: %s", ", ".join(duplicates))
+        return 2
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    summary_path = args.output / SUMMARY_FILE_NAME
+    previous = load_summary(summary_path)
+    rows = {}
+    todo = []
+    for name, target, source in pairs:
+        finished = all(path.exists() for path in output_paths(args.output, name))
+        if finished and not args.force:
+            rows[name] = previous.get(name) or {
+                "name": name, "target": str(target), "source": str(source), "status": "done"
+            }
+            continue
+        todo.append((name, target, source))
+    logger.info(
+        "Batch: %d pairs, %d already finished, %d to process",
+        len(pairs),
+        len(pairs) - len(todo),
+        len(todo),
+    )
+
+    options = {
+        "engine": args.engine,
+        "workers": args.workers,
+        "reduction": args.reduction,
+        "target_points": args.target_points,
+        "decimation_method": args.decimation_method,
+        "max_distance": COLORMAP_MAX_DISTANCE if args.bounded else None,
+        "roi": args.roi,
+    }
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(
+        max_workers=max(1, args.jobs),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_configure_worker_logging,
+    )
+    try:
+        futures = {
+            executor.submit(process_pair, name, target, source, str(args.output), options): (
+                name,
+                target,
+                source,
+            )
+            for name, target, source in todo
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                row = future.result()
+            except Exception as exc:
+                # A crashed worker (BrokenProcessPool) fails its pair and every
+                # pair still queued; a rerun retries them.
+                name, target, source = futures[future]
+                logger.error("Pair %s failed in its worker process: %s", name, exc)
+                row = {
+                    "name": name,
+                    "target": str(target),
+                    "source": str(source),
+                    "status": "failed",
+                    "error": f"{type(exc).__name__}: {exc}",
+                }
+            rows[row["name"]] = row
+            # Rewritten after every pair so an interrupted run keeps its summary.
+            write_summary(summary_path, [rows[name] for name in names if name in rows])
+            logger.info("Batch progress %d/%d: %s %s", done, len(todo), row["name"], row["status"])
+    except KeyboardInterrupt:
+        logger.warning("Batch interrupted; rerun the same command to resume")
+        executor.shutdown(wait=False, cancel_futures=True)
+        return 130
+    executor.shutdown()
+
+    failed = [row["name"] for row in rows.values() if row.get("status") == "failed"]
+    logger.info(
+        "Batch finished in %.1fs: %d done, %d failed; summary at %s",
+        time.perf_counter() - started,
+        len(rows) - len(failed),
+        len(failed),
+        summary_path,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
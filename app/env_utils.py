@@ -8,6 +8,7 @@ RUNTIME_ENV = "JSV_RUNTIME_DIR"
 LOG_ENV = "JSV_LOG_DIR"
 MPL_ENV = "MPLCONFIGDIR"
 XDG_CACHE_ENV = "XDG_CACHE_HOME"
+CACHE_ENV = "JSV_CACHE_DIR"
 
 
 def prepare_runtime_dirs():
@@ -44,6 +45,7 @@ def prepare_runtime_dirs():
     cache_dir = base / "cache"
     cache_dir.mkdir(parents=True, exist_ok=True)
     os.environ[XDG_CACHE_ENV] = str(cache_dir)
+    os.environ[CACHE_ENV] = str(cache_dir)
 
     (cache_dir / "fontconfig").mkdir(parents=True, exist_ok=True)
 
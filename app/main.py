@@ -1,27 +1,35 @@
+import multiprocessing
 import sys
 from pathlib import Path
 
 if __package__ is None or __package__ == '':
     sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.env_utils import prepare_runtime_dirs
 
-prepare_runtime_dirs()
+def main() -> int:
+    # Spawned worker processes re-import this module as __mp_main__, so the
+    # GUI imports and runtime setup only happen when the app actually starts.
+    from app.env_utils import prepare_runtime_dirs
 
-from PyQt5 import QtWidgets
+    prepare_runtime_dirs()
 
-from app.logging_config import configure_logging
-from app.ui import JointSpaceVisualizerApp
+    from PyQt5 import QtWidgets
 
-configure_logging()
+    from app.logging_config import configure_logging
+    from app.services import shutdown_worker_pool
+    from app.ui import JointSpaceVisualizerApp
 
+    configure_logging()
 
-def main() -> int:
     app = QtWidgets.QApplication(sys.argv)
     window = JointSpaceVisualizerApp()
     window.show()
-    return app.exec_()
+    try:
+        return app.exec_()
+    finally:
+        shutdown_worker_pool()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -1,21 +1,68 @@
 """Service helpers for core mesh operations."""
 
 from .mesh_ops import (
+    COLORMAP_MAX_DISTANCE,
+    DECIMATION_METHODS,
+    DEFAULT_DECIMATION_METHOD,
+    DEFAULT_DISTANCE_ENGINE,
+    DISTANCE_ENGINES,
+    DISTANCE_COLOR_POINTS,
+    DISTANCE_STAGES,
+    LOD_PROXY_POINTS,
+    UNCOMPUTED_RGB,
     MeshOperationError,
+    build_lod_proxy,
+    clear_result_cache,
     compute_distance,
+    DistanceColormap,
     DistanceComputationCancelled,
     create_custom_colormap,
+    distance_colormap,
+    decimate_mesh,
     load_mesh,
+    mesh_buffers,
+    replace_distance_scalars,
     save_colored_mesh,
+    same_geometry,
+    sample_point_scalars,
     save_mesh,
+    shared_copy,
 )
+from .cache import cache_stats
+from .distance_engine import shutdown_worker_pool
+from .isolation import compute_distance_isolated
+from .roi import compute_distance_in_roi, overlap_bounds
 
 __all__ = [
+    "COLORMAP_MAX_DISTANCE",
+    "DECIMATION_METHODS",
+    "DEFAULT_DECIMATION_METHOD",
+    "DEFAULT_DISTANCE_ENGINE",
+    "DISTANCE_ENGINES",
+    "DISTANCE_COLOR_POINTS",
+    "DISTANCE_STAGES",
+    "LOD_PROXY_POINTS",
+    "UNCOMPUTED_RGB",
     "MeshOperationError",
+    "build_lod_proxy",
+    "clear_result_cache",
     "compute_distance",
+    "DistanceColormap",
     "DistanceComputationCancelled",
     "create_custom_colormap",
+    "distance_colormap",
+    "decimate_mesh",
     "load_mesh",
+    "mesh_buffers",
+    "replace_distance_scalars",
     "save_colored_mesh",
+    "same_geometry",
+    "sample_point_scalars",
     "save_mesh",
+    "shared_copy",
+    "compute_distance_in_roi",
+    "overlap_bounds",
+    "cache_stats",
+    "compute_distance_isolated",
+    "shutdown_worker_pool",
 ]
@@ -0,0 +1,328 @@
+"""In-process caches for expensive mesh artefacts keyed by content fingerprints."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+import pyvista as pv
+from vtk.util.numpy_support import vtk_to_numpy
+
+logger = logging.getLogger(__name__)
+
+# Set by app.env_utils.prepare_runtime_dirs; without it disk tiers are disabled.
+CACHE_DIR_ENV = "JSV_CACHE_DIR"
+
+_registry: List[Any] = []
+
+
+def mesh_fingerprint(mesh: pv.PolyData) -> str:
+    """Hash of point coordinates and polygon connectivity."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray([mesh.n_points, mesh.n_cells], dtype=np.int64).tobytes())
+    if mesh.n_points:
+        digest.update(np.ascontiguousarray(mesh.points).view(np.uint8))
+    polys = mesh.GetPolys()
+    if polys is not None and polys.GetNumberOfCells():
+        for array in (polys.GetOffsetsArray(), polys.GetConnectivityArray()):
+            digest.update(np.ascontiguousarray(vtk_to_numpy(array)).view(np.uint8))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by an approximate byte budget."""
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        nbytes = int(nbytes)
+        if nbytes > self.max_bytes:
+            logger.info("%s cache: entry of %d bytes exceeds the budget; not cached", self.name, nbytes)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def get_or_create(
+        self,
+        key: Hashable,
+        factory: Callable[[], Any],
+        sizeof: Callable[[Any], int],
+    ) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value, sizeof(value))
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class DiskCache:
+    """Directory of ``.npz`` files bounded by total size, oldest files pruned first."""
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry.append(self)
+
+    @property
+    def directory(self) -> Optional[Path]:
+        root = os.environ.get(CACHE_DIR_ENV)
+        if not root:
+            return None
+        return Path(root) / self.name
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        directory = self.directory
+        path = directory / f"{key}.npz" if directory is not None else None
+        if path is None or not path.exists():
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)
+        except (OSError, ValueError):
+            logger.warning("%s disk cache: discarding unreadable %s", self.name, path, exc_info=True)
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return arrays
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        directory = self.directory
+        if directory is None:
+            return
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = directory / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with tmp.open("wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(tmp, directory / f"{key}.npz")
+        except OSError:
+            logger.warning("%s disk cache: failed to write %s", self.name, key, exc_info=True)
+            return
+        self._prune(directory)
+
+    def clear(self) -> None:
+        directory = self.directory
+        if directory is None or not directory.exists():
+            return
+        for path in directory.glob("*.npz"):
+            path.unlink(missing_ok=True)
+
+    def _files(self, directory: Path):
+        files = []
+        for path in directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _remove(self, path: Path) -> bool:
+        """Delete one entry; ``False`` when it is in use and has to stay."""
+        try:
+            path.unlink(missing_ok=True)
+        except PermissionError:
+            logger.info("%s disk cache: %s is in use; keeping it", self.name, path.name)
+            return False
+        return True
+
+    def _prune(self, directory: Path) -> None:
+        files = sorted(self._files(directory))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if not self._remove(path):
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        directory = self.directory
+        files = self._files(directory) if directory is not None and directory.exists() else []
+        with self._lock:
+            return {
+                "name": f"{self.name} (disk)",
+                "entries": len(files),
+                "bytes": sum(size for _, size, _ in files),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class MappedArrayCache(DiskCache):
+    """Disk cache whose entries are directories of ``.npy`` files loaded memory-mapped.
+
+    Unlike ``.npz`` archives the arrays are never read up front: ``load``
+    returns copy-on-write maps, so pages are faulted in as they are used and
+    writes stay private to the process.
+
+    Each store writes a new ``<key>.<version>`` directory and loads read the
+    newest one.  Meshes keep older versions mapped, and Windows can neither
+    replace nor delete a directory whose files are mapped.
+    """
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        directory = self.directory
+        versions = self._versions(directory, key) if directory is not None else []
+        if not versions:
+            with self._lock:
+                self.misses += 1
+            return None
+        entry = versions[-1]
+        arrays = {}
+        try:
+            names = json.loads((entry / "index.json").read_text(encoding="utf-8"))
+            for position, name in enumerate(names):
+                arrays[name] = np.load(entry / f"{position}.npy", mmap_mode="c", allow_pickle=False)
+            os.utime(entry)
+        except (OSError, ValueError):
+            logger.warning("%s disk cache: discarding unreadable %s", self.name, entry, exc_info=True)
+            # Unmap what was opened so far; mapped files cannot be deleted on Windows.
+            arrays.clear()
+            self._remove(entry)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return arrays
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        directory = self.directory
+        if directory is None:
+            return
+        tmp = directory / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            tmp.mkdir(parents=True, exist_ok=True)
+            names = list(arrays)
+            for position, name in enumerate(names):
+                np.save(tmp / f"{position}.npy", np.ascontiguousarray(arrays[name]), allow_pickle=False)
+            # Written last: an entry without its index is incomplete.
+            (tmp / "index.json").write_text(json.dumps(names), encoding="utf-8")
+            tmp.rename(directory / f"{key}.{time.time_ns():016x}{os.getpid():08x}")
+        except OSError:
+            logger.warning("%s disk cache: failed to write %s", self.name, key, exc_info=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        for stale in self._versions(directory, key)[:-1]:
+            self._remove(stale)
+        self._prune(directory)
+
+    def clear(self) -> None:
+        directory = self.directory
+        if directory is None or not directory.exists():
+            return
+        for entry, _ in self._entries(directory):
+            self._remove(entry)
+
+    def _versions(self, directory: Path, key: str) -> List[Path]:
+        """Complete entries stored under ``key``, oldest first."""
+        return sorted(path for path in directory.glob(f"{key}.*") if (path / "index.json").exists())
+
+    def _entries(self, directory: Path):
+        for entry in directory.iterdir():
+            if entry.is_dir() and not entry.name.startswith("."):
+                yield entry, entry.stat()
+
+    def _files(self, directory: Path):
+        files = []
+        for entry, stat in self._entries(directory):
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+            except OSError:
+                continue
+            files.append((stat.st_mtime, size, entry))
+        return files
+
+    def _remove(self, path: Path) -> bool:
+        # Moved aside first, so a partly deleted entry never looks complete.
+        # The move fails on Windows while a loaded mesh still maps the entry.
+        trash = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.trash")
+        try:
+            path.rename(trash)
+        except FileNotFoundError:
+            return True
+        except PermissionError:
+            logger.info("%s disk cache: %s is in use; keeping it", self.name, path.name)
+            return False
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+
+    def _prune(self, directory: Path) -> None:
+        # Leftovers of removals that could not finish, e.g. files still mapped.
+        for stale in directory.glob(".*.trash"):
+            shutil.rmtree(stale, ignore_errors=True)
+        super()._prune(directory)
+
+
+def cache_stats() -> List[dict]:
+    """Statistics of every cache created in this process."""
+    return [cache.stats() for cache in _registry]
+
+
+locator_cache = LRUCache("locator", max_bytes=768 * 1024 * 1024)
@@ -0,0 +1,619 @@
+"""NumPy/SciPy point-to-surface distance engine.
+
+Unsigned closest-point distances are found in two steps.  A KD-tree over
+the target vertices returns the few nearest vertices of each query point and
+the triangles incident to them give an upper bound ``d0``.  The closest
+triangle's bounding sphere then reaches within ``d0`` of the point, so a
+ball search over triangle centres followed by an exact point-triangle test
+yields the true closest distance, also on meshes with large triangles such
+as quadric-decimated ones.  Triangles are searched in classes of similar
+size, each with its own ball radius, so a few large triangles do not widen
+the search among many small ones.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pyvista as pv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 16384
+DEFAULT_NEIGHBOURS = 8
+# Serial chunks are resized to take about this long, which bounds how late a
+# cancel request is noticed regardless of mesh size or machine speed.
+CHUNK_TARGET_SECONDS = 0.03
+# Pool tasks are fixed-size; a cancelled run still finishes the running ones.
+PARALLEL_CHUNK_SIZE = 4096
+_MIN_CHUNK_SIZE = 64
+# Point-triangle tests evaluated at once by the exact refinement; bounds the
+# size of its temporary arrays when many triangles are candidates.
+_MAX_TRIANGLE_TESTS = 1 << 20
+# Triangles whose bounding radii differ by less than this factor are searched
+# together with the largest radius among them.
+_SIZE_CLASS_RATIO = 2.0
+
+# Unbalanced trees with loose node bounds answer queries that sit millimetres
+# away from the surface several times faster than SciPy's defaults.
+_TREE_OPTIONS = {"leafsize": 32, "balanced_tree": False, "compact_nodes": False}
+
+
+class TargetIndex:
+    """KD-trees over target vertices and triangle centres, plus incidence tables."""
+
+    def __init__(self, points: np.ndarray, faces: np.ndarray):
+        from scipy.spatial import cKDTree
+
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64)
+        flat = self.faces.ravel()
+        self.incident_faces = np.argsort(flat, kind="stable") // 3
+        self.valence = np.bincount(flat, minlength=len(self.points))
+        self.offsets = np.cumsum(self.valence) - self.valence
+        # Bounding disk of each triangle: centroid, farthest corner and unit
+        # normal (zero for degenerate triangles, whose disk is then a sphere).
+        self.face_centers = np.zeros((len(self.faces), 3))
+        self.face_radii = np.zeros(len(self.faces))
+        self.face_normals = np.zeros((len(self.faces), 3))
+        self.max_edge = 0.0
+        # (tree over centres, face ids, largest radius) per size class.
+        self.face_classes = []
+        if len(self.faces):
+            corners = self.points[self.faces]
+            self.max_edge = float(
+                np.sqrt(((corners - np.roll(corners, 1, axis=1)) ** 2).sum(axis=2)).max()
+            )
+            self.face_centers = corners.mean(axis=1)
+            self.face_radii = np.sqrt(
+                ((corners - self.face_centers[:, None, :]) ** 2).sum(axis=2).max(axis=1)
+            )
+            normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            lengths = np.linalg.norm(normals, axis=1)
+            np.divide(normals, lengths[:, None], out=self.face_normals, where=lengths[:, None] > 0)
+            # Radii within a factor of _SIZE_CLASS_RATIO share a class.
+            positive = self.face_radii[self.face_radii > 0]
+            smallest = positive.min() if len(positive) else 1.0
+            size_class = np.floor(
+                np.log(np.maximum(self.face_radii, smallest) / smallest) / np.log(_SIZE_CLASS_RATIO)
+            ).astype(np.int64)
+            order = np.argsort(size_class, kind="stable")
+            bounds = np.flatnonzero(np.diff(size_class[order])) + 1
+            for ids in np.split(order, bounds):
+                self.face_classes.append(
+                    (
+                        cKDTree(self.face_centers[ids], **_TREE_OPTIONS),
+                        ids,
+                        float(self.face_radii[ids].max()),
+                    )
+                )
+        self.tree = cKDTree(self.points, **_TREE_OPTIONS)
+
+    @property
+    def incidence(self):
+        return self.incident_faces, self.valence, self.offsets
+
+    @property
+    def n_faces(self) -> int:
+        return len(self.faces)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.points,
+            self.faces,
+            self.incident_faces,
+            self.valence,
+            self.offsets,
+            self.face_centers,
+            self.face_radii,
+            self.face_normals,
+        )
+        # cKDTree keeps its own copy of the points plus an index permutation;
+        # the centre trees together hold one entry per face plus its face id.
+        return (
+            sum(arr.nbytes for arr in arrays)
+            + len(self.points) * (3 * 8 + 8)
+            + len(self.faces) * (3 * 8 + 8 + 8)
+        )
+
+    @classmethod
+    def from_mesh(cls, mesh: pv.PolyData) -> "TargetIndex":
+        points, faces = triangle_arrays(mesh)
+        return cls(points, faces)
+
+
+def triangle_arrays(mesh: pv.PolyData):
+    """Return ``(points, faces)`` with faces as an ``(m, 3)`` index array."""
+    if not mesh.is_all_triangles:
+        mesh = mesh.triangulate()
+    faces = np.asarray(mesh.faces).reshape(-1, 4)[:, 1:]
+    return np.asarray(mesh.points), faces
+
+
+def squared_distance_to_triangles(p, a, b, c):
+    """Row-wise squared distance from ``p`` to triangles ``abc`` (Ericson 5.1.5)."""
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    bp = p - b
+    cp = p - c
+    d1 = np.einsum("ij,ij->i", ab, ap)
+    d2 = np.einsum("ij,ij->i", ac, ap)
+    d3 = np.einsum("ij,ij->i", ab, bp)
+    d4 = np.einsum("ij,ij->i", ac, bp)
+    d5 = np.einsum("ij,ij->i", ab, cp)
+    d6 = np.einsum("ij,ij->i", ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # Barycentric (v, w) of the closest point; Voronoi regions are applied in
+    # reverse precedence so the earlier tests of the scalar algorithm win.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        v = vb / denom
+        w = vc / denom
+
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        mask = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        v = np.where(mask, 1.0 - t, v)
+        w = np.where(mask, t, w)
+
+        t = d2 / (d2 - d6)
+        mask = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        v = np.where(mask, 0.0, v)
+        w = np.where(mask, t, w)
+
+        mask = (d6 >= 0) & (d5 <= d6)
+        v = np.where(mask, 0.0, v)
+        w = np.where(mask, 1.0, w)
+
+        t = d1 / (d1 - d3)
+        mask = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        v = np.where(mask, t, v)
+        w = np.where(mask, 0.0, w)
+
+        mask = (d3 >= 0) & (d4 <= d3)
+        v = np.where(mask, 1.0, v)
+        w = np.where(mask, 0.0, w)
+
+        mask = (d1 <= 0) & (d2 <= 0)
+        v = np.where(mask, 0.0, v)
+        w = np.where(mask, 0.0, w)
+
+    diff = ap - ab * v[:, None] - ac * w[:, None]
+    dist2 = np.einsum("ij,ij->i", diff, diff)
+    bad = ~np.isfinite(dist2)
+    if np.any(bad):
+        # Zero-area triangles: fall back to the nearest corner.
+        corners = np.minimum(
+            np.minimum(np.einsum("ij,ij->i", ap, ap), np.einsum("ij,ij->i", bp, bp)),
+            np.einsum("ij,ij->i", cp, cp),
+        )
+        dist2 = np.where(bad, corners, dist2)
+    return dist2
+
+
+def points_beyond_bounds(points: np.ndarray, bounds, max_distance: float) -> np.ndarray:
+    """Mask of points farther than ``max_distance`` from an axis-aligned box.
+
+    ``bounds`` uses the VTK ``(xmin, xmax, ymin, ymax, zmin, zmax)`` layout.
+    Anything outside the box by more than ``max_distance`` is provably that
+    far from every surface inside it.
+    """
+    lower = np.asarray(bounds[0::2], dtype=np.float64)
+    upper = np.asarray(bounds[1::2], dtype=np.float64)
+    gap = np.maximum(np.maximum(lower - points, points - upper), 0.0)
+    return (gap ** 2).sum(axis=1) > max_distance ** 2
+
+
+def query_distances(
+    index: TargetIndex,
+    points: np.ndarray,
+    neighbours: int = DEFAULT_NEIGHBOURS,
+    max_distance: Optional[float] = None,
+) -> np.ndarray:
+    """Exact unsigned distances from ``points`` to the indexed surface.
+
+    With ``max_distance`` the KD-tree search is bounded: a point whose nearest
+    vertex lies beyond ``max_distance`` plus the longest edge cannot reach any
+    triangle within the cutoff and is reported as ``max_distance`` without an
+    exact query.  Larger distances are clamped to the same value; distances
+    below the cutoff equal the unbounded ones.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.float64)
+    k = max(1, min(neighbours, len(index.points)))
+    if max_distance is None:
+        _, vertex_ids = index.tree.query(points, k=k)
+        vertex_ids = vertex_ids.reshape(len(points), k)
+        return _exact_distances(index, points, vertex_ids)
+
+    _, vertex_ids = index.tree.query(
+        points, k=k, distance_upper_bound=max_distance + index.max_edge
+    )
+    vertex_ids = vertex_ids.reshape(len(points), k)
+    missing = vertex_ids >= len(index.points)
+    within = ~missing[:, 0]
+    distances = np.full(len(points), float(max_distance))
+    if np.any(within):
+        # Pad missing neighbours with the nearest one; duplicates are harmless.
+        ids = np.where(missing, vertex_ids[:, :1], vertex_ids)[within]
+        distances[within] = _exact_distances(index, points[within], ids, max_distance)
+    return distances
+
+
+def _exact_distances(
+    index: TargetIndex,
+    points: np.ndarray,
+    vertex_ids: np.ndarray,
+    max_distance: Optional[float] = None,
+) -> np.ndarray:
+    """Closest distances given each point's ``k`` nearest vertices.
+
+    The triangles around the nearest vertices bound the distance from above
+    by ``d0``.  A triangle can only be closer if its bounding sphere comes
+    within ``d0``, so within each size class the candidates are the centres
+    inside ``d0`` plus the class's largest radius.  Of those, only triangles
+    whose bounding disk (in the triangle's plane) comes within ``d0`` get the
+    exact test.  The bound tightens as classes are searched.
+    """
+    k = vertex_ids.shape[1]
+    exact = _refine(index, points, vertex_ids.ravel(), np.full(len(points), k))
+    if max_distance is not None:
+        exact = np.minimum(exact, max_distance)
+    for tree, face_ids, radius in index.face_classes:
+        # The slack only absorbs rounding; it never drops a needed triangle.
+        slack = exact + 1e-9 * (1.0 + exact)
+        reach = slack + radius
+        counts = tree.query_ball_point(points, reach, return_length=True)
+        for start, stop in _test_batches(counts):
+            balls = tree.query_ball_point(
+                points[start:stop], reach[start:stop], return_sorted=False
+            )
+            total = int(counts[start:stop].sum())
+            if total == 0:
+                continue
+            faces = face_ids[
+                np.fromiter(itertools.chain.from_iterable(balls), dtype=np.int64, count=total)
+            ]
+            owner = np.repeat(np.arange(start, stop), counts[start:stop])
+            offset = points[owner] - index.face_centers[faces]
+            height = np.abs(np.einsum("ij,ij->i", offset, index.face_normals[faces]))
+            lateral = np.sqrt(np.maximum(np.einsum("ij,ij->i", offset, offset) - height ** 2, 0.0))
+            gap = np.maximum(lateral - index.face_radii[faces], 0.0)
+            near = height ** 2 + gap ** 2 <= slack[owner] ** 2
+            if not np.any(near):
+                continue
+            minima, owners = _segment_min(
+                squared_distance_to_triangles(points[owner[near]], *_corners(index, faces[near])),
+                owner[near],
+            )
+            exact[owners] = np.minimum(exact[owners], np.sqrt(minima))
+    return exact
+
+
+def _test_batches(counts: np.ndarray):
+    """Split points into ranges of at most ``_MAX_TRIANGLE_TESTS`` candidates (at least one point)."""
+    budget = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        spent = budget[start - 1] if start else 0
+        stop = int(np.searchsorted(budget, spent + _MAX_TRIANGLE_TESTS, side="right"))
+        stop = max(stop, start + 1)
+        yield start, stop
+        start = stop
+
+
+def _corners(index: TargetIndex, faces: np.ndarray):
+    corner_ids = index.faces[faces]
+    return (
+        index.points[corner_ids[:, 0]],
+        index.points[corner_ids[:, 1]],
+        index.points[corner_ids[:, 2]],
+    )
+
+
+def _expand(table, vertex_ids: np.ndarray, candidates: np.ndarray):
+    """Expand candidate vertices into ``(owner, face)`` pairs through ``table``.
+
+    ``table`` is :attr:`TargetIndex.incidence`.  ``vertex_ids`` is flat; the first ``candidates[0]`` entries belong to
+    point 0, the next ``candidates[1]`` to point 1 and so on.  Owners come
+    out in ascending order.
+    """
+    face_order, face_counts, face_offsets = table
+    owner_of_vertex = np.repeat(np.arange(len(candidates)), candidates)
+    counts = face_counts[vertex_ids]
+    total = int(counts.sum())
+    starts = np.repeat(face_offsets[vertex_ids], counts)
+    local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(owner_of_vertex, counts), face_order[starts + local]
+
+
+def _segment_min(values: np.ndarray, owner: np.ndarray):
+    """Minimum of ``values`` per distinct ascending ``owner``; returns ``(minima, owners)``."""
+    owners, starts = np.unique(owner, return_index=True)
+    return np.minimum.reduceat(values, starts), owners
+
+
+def _refine(
+    index: TargetIndex, points: np.ndarray, vertex_ids: np.ndarray, candidates: np.ndarray
+) -> np.ndarray:
+    """Exact distance to the triangles incident to each point's candidate vertices.
+
+    Arguments follow :func:`_expand`; every point needs at least one
+    candidate.  Points whose candidates have no triangles get the distance to
+    their first candidate vertex.
+    """
+    first = np.cumsum(candidates) - candidates
+    best = ((points - index.points[vertex_ids[first]]) ** 2).sum(axis=1)
+    owner, faces = _expand(index.incidence, vertex_ids, candidates)
+    if len(faces):
+        minima, owners = _segment_min(
+            squared_distance_to_triangles(points[owner], *_corners(index, faces)), owner
+        )
+        best[owners] = minima
+    return np.sqrt(best)
+
+
+def adaptive_chunks(
+    total: int,
+    max_chunk_size: int = DEFAULT_CHUNK_SIZE,
+    target_seconds: float = CHUNK_TARGET_SECONDS,
+):
+    """Yield ``(start, stop)`` ranges that each take about ``target_seconds``.
+
+    The size of the next range is derived from how long the caller took to
+    process the previous one, between a small floor and ``max_chunk_size``.
+    """
+    size = min(_MIN_CHUNK_SIZE, max_chunk_size)
+    start = 0
+    while start < total:
+        stop = min(start + size, total)
+        started = time.perf_counter()
+        yield start, stop
+        elapsed = time.perf_counter() - started
+        if elapsed > 0:
+            # Grow cautiously: the cost per point varies across the mesh.
+            scale = min(max(target_seconds / elapsed, 0.25), 2.0)
+            size = int(min(max(size * scale, _MIN_CHUNK_SIZE), max_chunk_size))
+        start = stop
+
+
+def compute_point_distances(
+    index: TargetIndex,
+    points: np.ndarray,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    should_abort: Optional[Callable[[], bool]] = None,
+    max_distance: Optional[float] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> Optional[np.ndarray]:
+    """Evaluate ``query_distances`` in batches; returns ``None`` when aborted.
+
+    Batches hold at most ``chunk_size`` points and are sized by
+    :func:`adaptive_chunks`, so ``should_abort`` is polled every
+    :data:`CHUNK_TARGET_SECONDS` or so.  ``progress`` receives the completed
+    fraction after every batch.
+    """
+    points = np.asarray(points)
+    distances = np.empty(len(points), dtype=np.float64)
+    for start, stop in adaptive_chunks(len(points), chunk_size):
+        if should_abort is not None and should_abort():
+            return None
+        distances[start:stop] = query_distances(
+            index, points[start:stop], max_distance=max_distance
+        )
+        if progress is not None:
+            progress(stop / len(points))
+    return distances
+
+
+# --- multi-process evaluation -------------------------------------------------
+
+# One pool for the whole process: spawning workers and importing NumPy/SciPy
+# in them costs more than a typical query.  Tasks name the shared-memory
+# segments of their job, which a worker only maps while it runs the task, and
+# each worker keeps the index of the last target.
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+_worker_state = {}
+
+
+def _publish(array: np.ndarray, handles: list) -> dict:
+    from multiprocessing import shared_memory
+
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    handles.append(shm)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+def _attach(spec: dict):
+    from multiprocessing import shared_memory
+
+    # Pool workers share the parent's resource tracker, so the segment stays
+    # registered once and is unlinked by the parent.
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    array = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+    return shm, array
+
+
+def _worker_index(specs: dict, target_key: str) -> TargetIndex:
+    """The index of the job's target, rebuilt only when the target changes."""
+    if _worker_state.get("target") != target_key:
+        _worker_state.pop("index", None)
+        target_handles = []
+        arrays = {}
+        for key in ("target_points", "target_faces"):
+            shm, array = _attach(specs[key])
+            target_handles.append(shm)
+            # Own copies, so the index outlives the job that published them.
+            arrays[key] = array.copy()
+            del array
+        for shm in target_handles:
+            shm.close()
+        _worker_state["index"] = TargetIndex(arrays["target_points"], arrays["target_faces"])
+        _worker_state["target"] = target_key
+    return _worker_state["index"]
+
+
+def _run_chunk(
+    specs: dict, target_key: str, max_distance: Optional[float], start: int, stop: int
+) -> float:
+    started = time.perf_counter()
+    index = _worker_index(specs, target_key)
+    # Mapped per task: once the parent has the results and unlinks the
+    # segments, no idle worker keeps them alive.
+    query_shm, query_points = _attach(specs["query_points"])
+    output_shm, distances = _attach(specs["distances"])
+    try:
+        distances[start:stop] = query_distances(
+            index, query_points[start:stop], max_distance=max_distance
+        )
+    finally:
+        del query_points, distances  # views must go before the segments close
+        query_shm.close()
+        output_shm.close()
+    return time.perf_counter() - started
+
+
+def _shared_pool(workers: int):
+    """The process-wide pool, (re)started when its size changes or it was discarded."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+            logger.info("Started distance worker pool with %d processes", workers)
+        return _pool
+
+
+def _discard_pool(pool) -> None:
+    """Drop a broken pool so the next :func:`_shared_pool` call starts a new one."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning("Distance worker pool broke; starting a new one")
+
+
+def shutdown_worker_pool() -> None:
+    """Stop the KD-tree worker pool; the next parallel query starts a new one."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("Distance worker pool shut down")
+
+
+def compute_point_distances_parallel(
+    target_points: np.ndarray,
+    target_faces: np.ndarray,
+    points: np.ndarray,
+    workers: int,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    should_abort: Optional[Callable[[], bool]] = None,
+    max_distance: Optional[float] = None,
+    progress: Optional[Callable[[float], None]] = None,
+    target_key: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """Evaluate distances on the shared process pool; returns ``None`` when aborted.
+
+    Target geometry, query points and the output buffer live in shared memory,
+    so tasks only carry segment names and ``(start, stop)`` ranges.  Workers
+    persist across calls (see :func:`shutdown_worker_pool`) and keep their
+    index while ``target_key`` (e.g. a mesh fingerprint) stays the same;
+    without it every call rebuilds the index.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    handles = []
+    points = np.asarray(points, dtype=np.float64)
+    output = None
+    pending = set()
+    try:
+        specs = {
+            "target_points": _publish(np.asarray(target_points, dtype=np.float64), handles),
+            "target_faces": _publish(np.asarray(target_faces, dtype=np.int64), handles),
+            "query_points": _publish(points, handles),
+            "distances": _publish(np.empty(len(points), dtype=np.float64), handles),
+        }
+        output = np.ndarray(len(points), dtype=np.float64, buffer=handles[-1].buf)
+        if target_key is None:
+            target_key = specs["target_points"]["name"]
+
+        started = time.perf_counter()
+        busy = 0.0
+        for attempt in range(2):
+            executor = _shared_pool(workers)
+            try:
+                pending = {
+                    executor.submit(
+                        _run_chunk,
+                        specs,
+                        target_key,
+                        max_distance,
+                        start,
+                        min(start + chunk_size, len(points)),
+                    )
+                    for start in range(0, len(points), chunk_size)
+                }
+                break
+            except BrokenProcessPool:
+                # A worker died during an earlier call; its pool refuses new work.
+                _discard_pool(executor)
+                if attempt:
+                    raise
+        total = len(pending)
+        while pending:
+            done, pending = wait(
+                pending, timeout=CHUNK_TARGET_SECONDS / 2, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                busy += future.result()
+            if done and progress is not None:
+                progress((total - len(pending)) / total)
+            if should_abort is not None and should_abort():
+                return None
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Parallel distance query: %d workers, %.2fs wall, %.2fs serial-equivalent "
+            "(speedup %.1fx)",
+            workers,
+            elapsed,
+            busy,
+            busy / elapsed if elapsed > 0 else 0.0,
+        )
+        return output.copy()
+    finally:
+        # Chunks already handed to a worker cannot be cancelled.  They keep
+        # their mapping of the segments, which only disappear once the last
+        # process closes them, and their results are discarded.
+        for future in pending:
+            future.cancel()
+        output = None  # drop the view before releasing the segment
+        for shm in handles:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:  # pragma: no cover - already released
+                pass
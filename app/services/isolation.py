@@ -0,0 +1,192 @@
+"""Distance computation in a disposable child process.
+
+A VTK filter running on a thread of the GUI process cannot be stopped, and
+the peak memory of a large run stays mapped in the GUI afterwards.  Here the
+job runs in a spawned process instead: input geometry is handed over as
+``.npy`` files the child memory-maps, the result comes back the same way,
+and only progress, log records and the final status travel over a queue.
+Cancelling terminates the process outright and the OS reclaims its memory
+when it exits.
+"""
+
+import logging
+import logging.handlers
+import queue
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import pyvista as pv
+
+from .mesh_ops import DistanceComputationCancelled, MeshOperationError
+
+logger = logging.getLogger(__name__)
+
+# How often the parent polls for messages, cancellation and child exit.
+_POLL_SECONDS = 0.02
+
+
+def _save_geometry(directory: Path, prefix: str, mesh: pv.PolyData) -> None:
+    np.save(directory / f"{prefix}_points.npy", np.asarray(mesh.points))
+    np.save(directory / f"{prefix}_faces.npy", np.asarray(mesh.faces))
+
+
+def _load_geometry(directory: Path, prefix: str, mmap_mode: Optional[str]) -> pv.PolyData:
+    points = np.load(directory / f"{prefix}_points.npy", mmap_mode=mmap_mode)
+    faces = np.load(directory / f"{prefix}_faces.npy", mmap_mode=mmap_mode)
+    return pv.PolyData(points, faces)
+
+
+def _child_main(directory: str, roi: bool, bounds, options: dict, messages) -> None:
+    """Entry point of the spawned process."""
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(messages)]
+    root.setLevel(logging.INFO)
+
+    from .mesh_ops import compute_distance
+    from .roi import compute_distance_in_roi
+
+    # Serial queries only: pool workers would outlive a terminated child and
+    # leak their shared-memory segments.
+    options = dict(options, workers=None)
+    directory = Path(directory)
+    try:
+        # Copy-on-write maps: pages are read lazily and never written back.
+        source = _load_geometry(directory, "source", "c")
+        target = _load_geometry(directory, "target", "c")
+
+        def progress(stage, fraction):
+            messages.put(("progress", stage, fraction))
+
+        if roi:
+            result, min_distance = compute_distance_in_roi(
+                source, target, bounds=bounds, progress=progress, **options
+            )
+        else:
+            result, min_distance = compute_distance(source, target, progress=progress, **options)
+
+        # Counts alone cannot tell a decimated or cropped mesh that happens to
+        # keep its size from the source itself.
+        same_geometry = (
+            result.n_points == source.n_points
+            and result.n_cells == source.n_cells
+            and np.array_equal(result.points, source.points)
+            and np.array_equal(result.faces, source.faces)
+        )
+        if not same_geometry:
+            _save_geometry(directory, "result", result)
+        arrays = {"point": list(result.point_data.keys()), "cell": list(result.cell_data.keys())}
+        for association, names in arrays.items():
+            data = result.point_data if association == "point" else result.cell_data
+            for position, name in enumerate(names):
+                np.save(directory / f"{association}_{position}.npy", np.asarray(data[name]))
+        messages.put(("done", min_distance, same_geometry, arrays))
+    except MeshOperationError as exc:
+        messages.put(("error", str(exc)))
+    except Exception as exc:  # pragma: no cover - reported to the parent
+        logging.getLogger(__name__).exception("Isolated distance computation failed")
+        messages.put(("error", f"{type(exc).__name__}: {exc}"))
+
+
+def compute_distance_isolated(
+    source_mesh: pv.PolyData,
+    target_mesh: pv.PolyData,
+    roi: bool = False,
+    bounds: Optional[Sequence[float]] = None,
+    abort_event: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+    **kwargs,
+) -> Tuple[pv.PolyData, Optional[float]]:
+    """Run :func:`compute_distance` (or :func:`compute_distance_in_roi` when
+    ``roi`` is true) in a child process and return its result.
+
+    ``abort_event`` is polled every few tens of milliseconds; when it fires
+    the child is terminated and :class:`DistanceComputationCancelled` is
+    raised.  ``progress`` receives the child's progress reports.  Remaining
+    keyword arguments are forwarded unchanged and must be picklable, except
+    ``workers``: the child always runs the KD-tree query serially.
+    """
+    import multiprocessing
+
+    started = time.perf_counter()
+    try:
+        directory = Path(tempfile.mkdtemp(prefix="jsv-distance-"))
+    except OSError as exc:
+        raise MeshOperationError(f"Could not create a temporary directory: {exc}") from exc
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    process = None
+    try:
+        try:
+            _save_geometry(directory, "source", source_mesh)
+            _save_geometry(directory, "target", target_mesh)
+        except OSError as exc:
+            raise MeshOperationError(f"Could not write the input meshes: {exc}") from exc
+        # The child starts no processes of its own, so terminating it (or the
+        # parent exiting) leaves nothing behind.
+        process = context.Process(
+            target=_child_main,
+            args=(str(directory), roi, bounds, kwargs, messages),
+            name="jsv-distance",
+            daemon=True,
+        )
+        try:
+            process.start()
+        except OSError as exc:
+            process = None
+            raise MeshOperationError(f"Could not start the distance process: {exc}") from exc
+        logger.info("Started isolated distance process %d", process.pid)
+
+        while True:
+            if abort_event is not None and abort_event():
+                logger.info("Terminating isolated distance process %d", process.pid)
+                raise DistanceComputationCancelled()
+            try:
+                message = messages.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if not process.is_alive():
+                    raise MeshOperationError(
+                        f"Distance process exited unexpectedly (exit code {process.exitcode})"
+                    )
+                continue
+            if isinstance(message, logging.LogRecord):
+                logging.getLogger(message.name).handle(message)
+            elif message[0] == "progress":
+                if progress is not None:
+                    progress(message[1], message[2])
+            elif message[0] == "error":
+                raise MeshOperationError(message[1])
+            else:
+                _, min_distance, same_geometry, arrays = message
+                break
+
+        try:
+            if same_geometry:
+                result = pv.PolyData()
+                result.shallow_copy(source_mesh)
+            else:
+                result = _load_geometry(directory, "result", None)
+            for association, names in arrays.items():
+                data = result.point_data if association == "point" else result.cell_data
+                for position, name in enumerate(names):
+                    data[name] = np.load(directory / f"{association}_{position}.npy")
+        except (OSError, ValueError) as exc:
+            raise MeshOperationError(f"Could not read the distance result: {exc}") from exc
+        logger.info(
+            "Isolated distance computation finished in %.2fs", time.perf_counter() - started
+        )
+        return result, min_distance
+    finally:
+        if process is not None:
+            if process.is_alive():
+                process.terminate()
+            process.join(1.0)
+            if process.is_alive():  # pragma: no cover - SIGTERM ignored
+                process.kill()
+                process.join()
+        messages.close()
+        messages.cancel_join_thread()
+        shutil.rmtree(directory, ignore_errors=True)
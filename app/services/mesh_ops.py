@@ -1,11 +1,45 @@
+import functools
+import hashlib
 import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import Callable, Optional, Tuple
 
+import numpy as np
 import pyvista as pv
 import vtk
+from vtk.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+
+from .cache import DiskCache, LRUCache, MappedArrayCache, locator_cache, mesh_fingerprint
 
 logger = logging.getLogger(__name__)
 
+DISTANCE_ENGINES = ("vtk", "kdtree")
+DEFAULT_DISTANCE_ENGINE = "vtk"
+DECIMATION_METHODS = ("quadric", "clustering")
+DEFAULT_DECIMATION_METHOD = "quadric"
+# Stages reported through the ``progress`` callback of compute_distance, in order.
+DISTANCE_STAGES = ("decimate_source", "decimate_target", "locator", "query", "wrap")
+# Upper end of the joint-space color scale; larger distances render saturated.
+COLORMAP_MAX_DISTANCE = 5.0
+UNCOMPUTED_RGB = (211, 211, 211)
+# Vertex budget of the stand-in meshes drawn while the camera is dragged.
+LOD_PROXY_POINTS = 50000
+
+_VTK_CHUNK_SIZE = 8192
+# How often a run waiting for a locator held by another run checks for cancel.
+_LOCK_POLL_SECONDS = 0.05
+
+_decimation_cache = LRUCache("decimation", max_bytes=512 * 1024 * 1024)
+_decimation_disk_cache = DiskCache("decimation", max_bytes=2 * 1024 * 1024 * 1024)
+# Distance arrays only; geometry is rebuilt from the inputs or the decimation cache.
+_result_disk_cache = DiskCache("distance", max_bytes=1024 * 1024 * 1024)
+# Parsed input meshes, memory-mapped on later loads of the same unchanged file.
+_mesh_file_cache = MappedArrayCache("meshes", max_bytes=4 * 1024 * 1024 * 1024)
+
 
 class MeshOperationError(RuntimeError):
     """Raised when a mesh-related operation fails."""
@@ -16,16 +50,291 @@ class DistanceComputationCancelled(RuntimeError):
 
 
 def load_mesh(path: str) -> pv.PolyData:
+    """Read a mesh, going through the memory-mapped mesh cache.
+
+    The cache key covers the absolute path, size and modification time, so
+    an edited or replaced file is parsed again.
+    """
+    started = time.perf_counter()
+    key = _mesh_file_key(path)
+    arrays = _mesh_file_cache.load(key) if key is not None else None
+    if arrays is not None:
+        mesh = _mesh_from_arrays(arrays)
+        logger.info(
+            "Loaded mesh from %s (%d points) in %.3fs from the mesh cache",
+            path,
+            mesh.n_points,
+            time.perf_counter() - started,
+        )
+        return mesh
+
     try:
-        mesh = pv.read(path)
+        mesh = read_binary_stl(path) if path.lower().endswith(".stl") else None
+        if mesh is None:
+            mesh = pv.read(path)
     except Exception as exc:  # pragma: no cover - PyVista provides detail
         logger.exception("Failed to load mesh from %s", path)
         raise MeshOperationError(str(exc)) from exc
 
-    logger.info("Loaded mesh from %s (%d points)", path, mesh.n_points)
+    logger.info(
+        "Loaded mesh from %s (%d points) in %.3fs", path, mesh.n_points, time.perf_counter() - started
+    )
+    if key is not None and _cacheable_surface(mesh):
+        _mesh_file_cache.store(key, _mesh_to_arrays(mesh))
     return mesh
 
 
+_STL_HEADER_BYTES = 84
+_STL_TRIANGLE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+
+
+def read_binary_stl(path: str) -> Optional[pv.PolyData]:
+    """Read a binary STL with NumPy; ``None`` when the file is not binary STL.
+
+    Triangles are memory-mapped as a structured array and bit-identical
+    corners are welded with one vectorized sort (see :func:`_weld_corners`),
+    keeping first-occurrence order.  As with ``vtkSTLReader``, triangles
+    that collapse after welding are dropped.
+    """
+    size = os.path.getsize(path)
+    if size < _STL_HEADER_BYTES:
+        return None
+    with open(path, "rb") as handle:
+        handle.seek(80)
+        count = int(np.frombuffer(handle.read(4), dtype="<u4")[0])
+    # ASCII files ("solid ...") practically never satisfy the exact size.
+    if size != _STL_HEADER_BYTES + count * _STL_TRIANGLE.itemsize:
+        return None
+    if count == 0:
+        return pv.PolyData()
+
+    triangles = np.memmap(path, dtype=_STL_TRIANGLE, mode="r", offset=_STL_HEADER_BYTES, shape=(count,))
+    # Adding 0.0 turns -0.0 into 0.0 so both weld to the same vertex.
+    corners = np.ascontiguousarray(triangles["vertices"].reshape(-1, 3)) + np.float32(0.0)
+    del triangles
+    points, connectivity = _weld_corners(corners)
+    connectivity = connectivity.reshape(-1, 3)
+    valid = (
+        (connectivity[:, 0] != connectivity[:, 1])
+        & (connectivity[:, 1] != connectivity[:, 2])
+        & (connectivity[:, 0] != connectivity[:, 2])
+    )
+    connectivity = connectivity[valid]
+    return _mesh_from_arrays(
+        {
+            "points": points,
+            "offsets": np.arange(0, 3 * len(connectivity) + 1, 3, dtype=np.int64),
+            "connectivity": connectivity.ravel(),
+        }
+    )
+
+
+def _weld_corners(corners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge bit-identical rows of ``corners``; returns (points, connectivity).
+
+    Points keep the order of their first occurrence.  ``np.unique`` over
+    12-byte row views falls back to a slow comparison sort, so rows are
+    sorted by their packed x/y bits instead and z only breaks the rare ties.
+    """
+    bits = corners.view(np.uint32)
+    xy = (bits[:, 0].astype(np.uint64) << np.uint64(32)) | bits[:, 1]
+    z = bits[:, 2]
+    order = np.argsort(xy)
+    sorted_xy, sorted_z = xy[order], z[order]
+    starts = np.empty(len(order), dtype=bool)
+    starts[0] = True
+    np.not_equal(sorted_xy[1:], sorted_xy[:-1], out=starts[1:])
+    if np.any(~starts[1:] & (sorted_z[1:] != sorted_z[:-1])):
+        # Same x and y but a different z: sort on all three coordinates.
+        order = np.lexsort((z, xy))
+        sorted_xy, sorted_z = xy[order], z[order]
+        starts[1:] = (sorted_xy[1:] != sorted_xy[:-1]) | (sorted_z[1:] != sorted_z[:-1])
+    first = np.minimum.reduceat(order, np.flatnonzero(starts))
+    by_first = np.argsort(first)
+    rank = np.empty_like(by_first)
+    rank[by_first] = np.arange(len(by_first))
+    connectivity = np.empty(len(order), dtype=np.int64)
+    connectivity[order] = rank[np.cumsum(starts) - 1]
+    return corners[first[by_first]], connectivity
+
+
+def _mesh_file_key(path: str) -> Optional[str]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(os.path.abspath(path).encode("utf-8", "surrogateescape"))
+    digest.update(np.asarray([stat.st_size, stat.st_mtime_ns], dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _cacheable_surface(mesh) -> bool:
+    # Only plain polygon surfaces round-trip through points + polys.
+    return (
+        isinstance(mesh, pv.PolyData)
+        and mesh.n_points > 0
+        and mesh.GetNumberOfVerts() == 0
+        and mesh.GetNumberOfLines() == 0
+        and mesh.GetNumberOfStrips() == 0
+    )
+
+
+def _mesh_to_arrays(mesh: pv.PolyData) -> dict:
+    polys = mesh.GetPolys()
+    arrays = {
+        "points": np.asarray(mesh.points),
+        "offsets": vtk_to_numpy(polys.GetOffsetsArray()),
+        "connectivity": vtk_to_numpy(polys.GetConnectivityArray()),
+    }
+    for name in mesh.point_data.keys():
+        arrays[f"point/{name}"] = np.asarray(mesh.point_data[name])
+    for name in mesh.cell_data.keys():
+        arrays[f"cell/{name}"] = np.asarray(mesh.cell_data[name])
+    return arrays
+
+
+def _mesh_from_arrays(arrays: dict) -> pv.PolyData:
+    """Wrap cached arrays without copying; VTK keeps references to the maps."""
+    cells = vtk.vtkCellArray()
+    cells.SetData(
+        numpy_to_vtk(arrays["offsets"], deep=False, array_type=vtk.VTK_ID_TYPE),
+        numpy_to_vtk(arrays["connectivity"], deep=False, array_type=vtk.VTK_ID_TYPE),
+    )
+    mesh = pv.PolyData()
+    mesh.SetPoints(pv.vtk_points(arrays["points"], deep=False))
+    mesh.SetPolys(cells)
+    for key, values in arrays.items():
+        association, _, name = key.partition("/")
+        if association == "point":
+            mesh.point_data[name] = values
+        elif association == "cell":
+            mesh.cell_data[name] = values
+    return mesh
+
+
+_CELL_ARRAYS = ("Verts", "Lines", "Polys", "Strips")
+
+
+def shared_copy(mesh: pv.DataSet) -> pv.DataSet:
+    """Copy of ``mesh`` that shares its point, cell and data buffers.
+
+    The copy gets its own ``vtkPoints``, cell arrays and attribute
+    containers, so replacing geometry, adding or removing arrays and
+    changing active scalars on either mesh leaves the other untouched.
+    Only in-place writes into the shared buffers would show through; code
+    that needs those must take ``mesh.copy()`` first.  Meshes loaded from
+    the mapped file cache are additionally copy-on-write at the page level.
+    """
+    copy = mesh.copy(deep=False)
+    if mesh.GetPoints() is not None:
+        points = vtk.vtkPoints()
+        points.SetData(mesh.GetPoints().GetData())
+        copy.SetPoints(points)
+    if isinstance(mesh, vtk.vtkPolyData):
+        for kind in _CELL_ARRAYS:
+            source_cells = getattr(mesh, f"Get{kind}")()
+            if source_cells is None or source_cells.GetNumberOfCells() == 0:
+                continue
+            cells = vtk.vtkCellArray()
+            cells.SetData(source_cells.GetOffsetsArray(), source_cells.GetConnectivityArray())
+            getattr(copy, f"Set{kind}")(cells)
+    return copy
+
+
+def mesh_buffers(mesh: pv.DataSet) -> dict:
+    """Data buffers held by ``mesh`` as ``{address: nbytes}``.
+
+    Meshes sharing buffers (see :func:`shared_copy`) report the same
+    addresses, so the union over several meshes gives their real footprint.
+    """
+    arrays = []
+    if mesh.GetPoints() is not None:
+        arrays.append(mesh.GetPoints().GetData())
+    if isinstance(mesh, vtk.vtkPolyData):
+        for kind in _CELL_ARRAYS:
+            cells = getattr(mesh, f"Get{kind}")()
+            # empty cell arrays still hold a one-entry offsets array
+            if cells is not None and cells.GetNumberOfCells():
+                arrays += [cells.GetOffsetsArray(), cells.GetConnectivityArray()]
+    for data in (mesh.GetPointData(), mesh.GetCellData(), mesh.GetFieldData()):
+        arrays += [data.GetArray(index) for index in range(data.GetNumberOfArrays())]
+    buffers = {}
+    for array in arrays:
+        if array is None or array.GetNumberOfTuples() == 0:
+            continue
+        values = vtk_to_numpy(array)
+        buffers[values.__array_interface__["data"][0]] = values.nbytes
+    return buffers
+
+
+def _geometry_arrays(mesh: pv.PolyData) -> list:
+    arrays = [mesh.GetPoints().GetData()]
+    for kind in _CELL_ARRAYS:
+        cells = getattr(mesh, f"Get{kind}")()
+        arrays += [cells.GetOffsetsArray(), cells.GetConnectivityArray()]
+    return [vtk_to_numpy(array) for array in arrays]
+
+
+def same_geometry(first: pv.DataSet, second: pv.DataSet) -> bool:
+    """Whether two surfaces have identical points and cells.
+
+    Meshes sharing their buffers (decimation cache hits, :func:`shared_copy`)
+    are recognized without touching the data; others are compared by value.
+    """
+    if first is second:
+        return True
+    if not (isinstance(first, vtk.vtkPolyData) and isinstance(second, vtk.vtkPolyData)):
+        return False
+    if first.GetPoints() is None or second.GetPoints() is None:
+        return False
+    if first.GetNumberOfPoints() != second.GetNumberOfPoints():
+        return False
+    for kind in _CELL_ARRAYS:
+        if getattr(first, f"GetNumberOf{kind}")() != getattr(second, f"GetNumberOf{kind}")():
+            return False
+    for left, right in zip(_geometry_arrays(first), _geometry_arrays(second)):
+        if left.shape != right.shape:
+            return False
+        if left.__array_interface__["data"][0] == right.__array_interface__["data"][0]:
+            continue
+        if not np.array_equal(left, right):
+            return False
+    return True
+
+
+def _distance_data(mesh: pv.DataSet):
+    if "Distance" in mesh.point_data:
+        return mesh.point_data, "point"
+    if "Distance" in mesh.cell_data:
+        return mesh.cell_data, "cell"
+    return None, None
+
+
+def replace_distance_scalars(displayed: pv.DataSet, previous: pv.DataSet, result: pv.DataSet) -> bool:
+    """Copy the distances of ``result`` into ``displayed`` in place.
+
+    ``displayed`` is the mesh currently rendered for ``previous``.  The swap
+    only happens when ``result`` has the same geometry as ``previous`` and
+    carries its distances with the same association; otherwise nothing is
+    touched and False is returned, and the caller has to rebuild the actor.
+    """
+    distances, assoc = _distance_data(result)
+    if distances is None or _distance_data(previous)[1] != assoc:
+        return False
+    if not same_geometry(previous, result):
+        return False
+    data = displayed.point_data if assoc == "point" else displayed.cell_data
+    values = distances["Distance"]
+    if "Distance" not in data or len(data["Distance"]) != len(values):
+        return False
+    data["Distance"] = values
+    displayed.Modified()
+    return True
+
+
 def save_mesh(mesh: pv.DataSet, path: str) -> None:
     try:
         mesh.save(path)
@@ -46,33 +355,174 @@ def _extract_scalar_array(mesh: pv.DataSet, name: str):
     return None
 
 
-def save_colored_mesh(mesh: pv.DataSet, lut: pv.LookupTable, path: str, scalar_name: str = "Distance") -> None:
+def lut_rgb_table(lut) -> np.ndarray:
+    """``(N, 3)`` uint8 colors of a :class:`DistanceColormap` or ``pv.LookupTable``."""
+    if isinstance(lut, DistanceColormap):
+        return lut.rgb_table
+    return np.asarray(lut.values)[:, :3]
+
+
+def bake_colors(distances, lut, table: Optional[np.ndarray] = None) -> np.ndarray:
+    """Map scalars to uint8 RGB by table lookup; non-finite values get :data:`UNCOMPUTED_RGB`.
+
+    Values are quantized to table indices exactly as a matplotlib colormap
+    does, so the colors match ``cmap(norm)`` without its float RGBA array.
+    """
+    if table is None:
+        table = lut_rgb_table(lut)
+    distances = np.asarray(distances)
+    rng_min, rng_max = lut.scalar_range
+    if rng_max <= rng_min:
+        rng_min, rng_max = float(np.nanmin(distances)), float(np.nanmax(distances))
+        if rng_max <= rng_min:
+            rng_max = rng_min + 1.0
+    missing = np.isnan(distances)
+    scaled = np.subtract(distances, rng_min, dtype=np.float64)
+    scaled /= rng_max - rng_min
+    scaled *= len(table)
+    np.clip(scaled, 0, len(table) - 1, out=scaled)
+    scaled[missing] = 0
+    rgb = table[scaled.astype(np.intp)]
+    # Vertices left out of an ROI computation carry NaN distances.
+    rgb[missing] = UNCOMPUTED_RGB
+    return rgb
+
+
+# Vertices/faces per block written by the PLY writer, bounding its temporaries.
+_PLY_BLOCK = 1 << 20
+
+
+def write_colored_ply(path: str, points, offsets, connectivity, rgb) -> None:
+    """Stream a binary little-endian PLY with per-vertex colors.
+
+    ``offsets``/``connectivity`` are the VTK cell-array layout of the faces.
+    Vertex and face records are assembled with NumPy in fixed-size blocks.
+    """
+    points = np.asarray(points)
+    coord = "double" if points.dtype == np.float64 else "float"
+    vertex_dtype = np.dtype(
+        [("xyz", "<f8" if coord == "double" else "<f4", (3,)), ("rgb", "u1", (3,))]
+    )
+    sizes = np.diff(offsets)
+    if len(sizes) and sizes.max() > 255:
+        raise MeshOperationError("PLY faces are limited to 255 vertices")
+    header = "\n".join(
+        [
+            "ply",
+            "format binary_little_endian 1.0",
+            f"element vertex {len(points)}",
+            f"property {coord} x",
+            f"property {coord} y",
+            f"property {coord} z",
+            "property uchar red",
+            "property uchar green",
+            "property uchar blue",
+            f"element face {len(sizes)}",
+            "property list uchar int vertex_indices",
+            "end_header",
+        ]
+    )
+    with open(path, "wb") as handle:
+        handle.write(header.encode("ascii") + b"\n")
+        for start in range(0, len(points), _PLY_BLOCK):
+            stop = min(start + _PLY_BLOCK, len(points))
+            block = np.empty(stop - start, dtype=vertex_dtype)
+            block["xyz"] = points[start:stop]
+            block["rgb"] = rgb[start:stop]
+            handle.write(block.tobytes())
+        for start in range(0, len(sizes), _PLY_BLOCK):
+            stop = min(start + _PLY_BLOCK, len(sizes))
+            first, last = offsets[start], offsets[stop]
+            # Each record is a one-byte count followed by 4-byte indices.
+            count_at = (offsets[start:stop] - first) * 4 + np.arange(stop - start)
+            block = np.empty((stop - start) + 4 * (last - first), dtype=np.uint8)
+            is_index = np.ones(len(block), dtype=bool)
+            is_index[count_at] = False
+            block[count_at] = sizes[start:stop]
+            block[is_index] = np.asarray(connectivity[first:last], dtype="<i4").view(np.uint8)
+            handle.write(block.tobytes())
+
+
+def save_colored_mesh(mesh: pv.DataSet, lut, path: str, scalar_name: str = "Distance") -> None:
     distances = _extract_scalar_array(mesh, scalar_name)
     if distances is None or len(distances) == 0:
         message = f"Mesh missing '{scalar_name}' scalars; cannot bake colors"
         logger.error(message)
         raise MeshOperationError(message)
 
-    import numpy as np
-
-    colored_mesh = mesh.copy()
+    started = time.perf_counter()
     try:
-        rng_min, rng_max = lut.scalar_range
-        if rng_max <= rng_min:
-            rng_min, rng_max = float(np.min(distances)), float(np.max(distances))
-            if rng_max <= rng_min:
-                rng_max = rng_min + 1.0
-        norm = (np.asarray(distances) - rng_min) / (rng_max - rng_min)
-        norm = np.clip(norm, 0.0, 1.0)
-        cmap = lut.cmap
-        rgba = cmap(norm)
-        colored_mesh.point_data['RGB'] = (rgba[:, :3] * 255).astype(np.uint8)
-        colored_mesh.save(path, binary=True)
+        rgb = bake_colors(distances, lut)
+        plain_surface = (
+            isinstance(mesh, pv.PolyData)
+            and len(rgb) == mesh.n_points
+            and mesh.GetNumberOfVerts() == 0
+            and mesh.GetNumberOfLines() == 0
+            and mesh.GetNumberOfStrips() == 0
+        )
+        if plain_surface and path.lower().endswith(".ply"):
+            polys = mesh.GetPolys()
+            write_colored_ply(
+                path,
+                mesh.points,
+                vtk_to_numpy(polys.GetOffsetsArray()),
+                vtk_to_numpy(polys.GetConnectivityArray()),
+                rgb,
+            )
+        else:
+            # Shallow copy: shares geometry and arrays, only RGB is added.
+            colored_mesh = mesh.copy(deep=False)
+            colored_mesh.point_data['RGB'] = rgb
+            colored_mesh.save(path, binary=True)
+    except MeshOperationError:
+        raise
     except Exception as exc:  # pragma: no cover - PyVista provides detail
         logger.exception("Failed to save colored mesh to %s", path)
         raise MeshOperationError(str(exc)) from exc
 
-    logger.info("Saved colored mesh to %s", path)
+    logger.info("Saved colored mesh to %s in %.2fs", path, time.perf_counter() - started)
+
+
+def sample_point_scalars(mesh: pv.DataSet, points, name: str):
+    """Value of point array ``name`` at the vertex of ``mesh`` nearest to each point."""
+    probe = pv.PolyData(np.asarray(points, dtype=np.float64))
+    interpolator = vtk.vtkPointInterpolator()
+    interpolator.SetInputData(probe)
+    interpolator.SetSourceData(mesh)
+    interpolator.SetKernel(vtk.vtkVoronoiKernel())
+    interpolator.Update()
+    return np.asarray(pv.wrap(interpolator.GetOutput()).point_data[name])
+
+
+def build_lod_proxy(
+    mesh: pv.PolyData, target_points: int = LOD_PROXY_POINTS, scalar_name: str = "Distance"
+) -> Optional[pv.PolyData]:
+    """Coarse stand-in for ``mesh`` to draw during camera motion.
+
+    Returns ``None`` when ``mesh`` is already within ``target_points``.  The
+    proxy comes from a clustering decimation and carries ``scalar_name``
+    sampled from the nearest original point or cell, so it colors like the
+    full mesh.  It bypasses the decimation caches: proxies are cheap to
+    rebuild and would only evict decimations the distance runs reuse.
+    """
+    reduction = _budget_reduction(mesh, target_points)
+    if reduction is None or mesh.n_cells == 0:
+        return None
+    started = time.perf_counter()
+    proxy = _cluster_decimate(mesh, reduction)
+    if scalar_name in mesh.point_data:
+        proxy.point_data[scalar_name] = sample_point_scalars(mesh, proxy.points, scalar_name)
+    elif scalar_name in mesh.cell_data:
+        proxy.cell_data[scalar_name] = sample_point_scalars(
+            mesh.cell_centers(), proxy.cell_centers().points, scalar_name
+        )
+    logger.info(
+        "Built LOD proxy: %d -> %d points in %.2fs",
+        mesh.n_points,
+        proxy.n_points,
+        time.perf_counter() - started,
+    )
+    return proxy
 
 
 def compute_distance(
@@ -80,8 +530,58 @@ def compute_distance(
     target_mesh: pv.PolyData,
     reduction: Optional[float] = None,
     abort_event: Optional[Callable[[], bool]] = None,
-    filter_callback: Optional[Callable[[vtk.vtkDistancePolyDataFilter], None]] = None,
+    engine: str = DEFAULT_DISTANCE_ENGINE,
+    workers: Optional[int] = None,
+    max_distance: Optional[float] = None,
+    target_points: Optional[int] = None,
+    decimation_method: str = DEFAULT_DECIMATION_METHOD,
+    progress: Optional[Callable[[str, float], None]] = None,
+    cache: bool = True,
 ) -> Tuple[pv.PolyData, Optional[float]]:
+    """Compute unsigned source-to-target distances into a ``Distance`` point array.
+
+    ``engine`` selects ``"vtk"`` (vtkImplicitPolyDataDistance, the evaluator
+    behind vtkDistancePolyDataFilter) or ``"kdtree"`` (vectorized NumPy/SciPy
+    search in :mod:`app.services.distance_engine`).  The target's search
+    structure is kept in :data:`app.services.cache.locator_cache`.
+    ``workers`` > 1 spreads the KD-tree query over that many processes.
+    ``max_distance`` clamps every distance to the cutoff.  Vertices outside
+    the target's bounding box by more than the cutoff are never queried; the
+    KD-tree engine also skips vertices with no target vertex within the
+    cutoff plus the longest target edge, while the VTK engine evaluates every
+    vertex inside the box in full.  Distances below the cutoff equal those of
+    an unbounded run.
+
+    Decimation is driven either by a fixed ``reduction`` ratio or by a
+    ``target_points`` vertex budget, in which case each mesh gets its own
+    ratio and meshes already within budget are left alone.
+    ``decimation_method`` is ``"quadric"`` or the faster, coarser
+    ``"clustering"``.
+
+    ``progress`` is called as ``progress(stage, fraction)`` with a stage from
+    :data:`DISTANCE_STAGES`; decimation stages may report from worker threads.
+
+    Distance arrays are memoized on disk per input fingerprints and the
+    options that affect the values; see :func:`clear_result_cache`.
+    ``cache=False`` still reads the decimation and result caches but stores
+    nothing in them, for throwaway passes such as progressive previews.
+    """
+    if engine not in DISTANCE_ENGINES:
+        raise MeshOperationError(f"Unknown distance engine: {engine}")
+    if decimation_method not in DECIMATION_METHODS:
+        raise MeshOperationError(f"Unknown decimation method: {decimation_method}")
+    if reduction is not None and target_points is not None:
+        raise MeshOperationError("Specify either reduction or target_points, not both")
+    if target_points is not None and target_points < 1:
+        raise MeshOperationError("target_points must be positive")
+    if engine == "kdtree" and not _scipy_available():
+        logger.warning("SciPy unavailable; falling back to the VTK distance engine")
+        engine = "vtk"
+    if workers is not None and workers > 1 and engine != "kdtree":
+        logger.info("Ignoring workers=%d; only the KD-tree engine runs in parallel", workers)
+    if max_distance is not None and max_distance <= 0:
+        raise MeshOperationError("max_distance must be positive")
+
     def _should_abort() -> bool:
         if abort_event is None:
             return False
@@ -98,121 +598,681 @@ def compute_distance(
         except Exception:
             return False
 
+    def _report(stage: str, fraction: float) -> None:
+        if progress is None:
+            return
+        try:
+            progress(stage, min(max(float(fraction), 0.0), 1.0))
+        except Exception:
+            logger.debug("Progress callback failed", exc_info=True)
+
     try:
         src = source_mesh
         tgt = target_mesh
         if _should_abort():
             logger.info("Distance computation aborted before processing")
             raise DistanceComputationCancelled()
-        if reduction is not None:
-            src = src.decimate(reduction)
-            if _should_abort():
-                logger.info("Distance computation aborted after source decimation")
-                raise DistanceComputationCancelled()
-            tgt = tgt.decimate(reduction)
-            logger.info("Applied decimation with reduction %.2f", reduction)
+        reductions = (reduction, reduction)
+        if target_points is not None:
+            reductions = (
+                _budget_reduction(src, target_points),
+                _budget_reduction(tgt, target_points),
+            )
+            logger.info(
+                "Vertex budget %d: source reduction %s, target reduction %s",
+                target_points,
+                *("%.3f" % value if value is not None else "none" for value in reductions),
+            )
+        if any(value is not None for value in reductions):
+            src, tgt = _decimate_pair(
+                src, tgt, reductions, decimation_method, _should_abort, _report, cache
+            )
+            logger.info(
+                "Applied %s decimation: source %d -> %d, target %d -> %d points",
+                decimation_method,
+                source_mesh.n_points,
+                src.n_points,
+                target_mesh.n_points,
+                tgt.n_points,
+            )
             if _should_abort():
-                logger.info("Distance computation aborted after target decimation")
+                logger.info("Distance computation aborted after decimation")
                 raise DistanceComputationCancelled()
 
-        dist_filter = vtk.vtkDistancePolyDataFilter()
-        dist_filter.SetInputData(0, src)
-        dist_filter.SetInputData(1, tgt)
-        dist_filter.SignedDistanceOff()
+        result_key = "_".join(
+            (
+                mesh_fingerprint(source_mesh),
+                mesh_fingerprint(target_mesh),
+                engine,
+                decimation_method,
+                "r%s" % ("none" if reduction is None else "%.6f" % reduction),
+                "p%s" % ("none" if target_points is None else target_points),
+                "d%s" % ("none" if max_distance is None else "%.6f" % max_distance),
+            )
+        )
+        cached = _load_cached_result(result_key, src)
+        if cached is not None:
+            _report("query", 1.0)
+            _report("wrap", 1.0)
+            return cached, _log_distance_range(cached.point_data['Distance'], max_distance)
 
-        if filter_callback is not None:
-            try:
-                filter_callback(dist_filter)
-            except Exception:  # noqa: S110 - defensive
-                logger.debug("Filter callback raised", exc_info=True)
-
-        aborted = {"flag": False}
-
-        if abort_event is not None:
-            def _vtk_abort(caller, event):  # pragma: no cover - callback invoked by VTK
-                if _should_abort():
-                    aborted["flag"] = True
-                    try:
-                        caller.AbortExecuteOn()
-                    except AttributeError:
-                        caller.SetAbortExecute(True)
-                    try:
-                        execu = caller.GetExecutive()
-                    except AttributeError:
-                        execu = None
-                    if execu is not None:
-                        try:
-                            execu.SetAbortExecute(1)
-                        except AttributeError:
-                            pass
-
-            for evt in (
-                vtk.vtkCommand.AbortCheckEvent,
-                vtk.vtkCommand.ProgressEvent,
-                vtk.vtkCommand.StartEvent,
-                vtk.vtkCommand.EndEvent,
-            ):
-                dist_filter.AddObserver(evt, _vtk_abort)
-
-        dist_filter.Update()
-        if _should_abort():
-            aborted["flag"] = True
+        if max_distance is not None:
+            result = _compute_distance_bounded(
+                src, tgt, float(max_distance), engine, workers, _should_abort, _report
+            )
+            distances = result.point_data['Distance']
+            if cache:
+                _store_cached_result(result_key, result)
+            return result, _log_distance_range(distances, max_distance)
 
-        if aborted["flag"] or _should_abort():
-            try:
-                dist_filter.AbortExecuteOff()
-            except AttributeError:  # pragma: no cover - older VTK
-                pass
-            logger.info("Distance computation aborted during filter execution")
-            raise DistanceComputationCancelled()
+        if engine == "kdtree":
+            distances = _kdtree_point_distances(
+                src.points, tgt, _should_abort, workers, progress=_report
+            )
+            _report("wrap", 0.0)
+            result = _wrap_point_distances(src, distances)
+            _report("wrap", 1.0)
+            if cache:
+                _store_cached_result(result_key, result)
+            return result, _log_distance_range(distances)
 
-        result = pv.wrap(dist_filter.GetOutput())
-        distances = result.get_array('Distance')
+        # Point and cell-center queries split the query stage by their sizes.
+        point_share = src.n_points / max(src.n_points + src.n_cells, 1)
+        distances = _vtk_point_distances(
+            src.points, tgt, _should_abort, _rescaled(_report, "query", 0.0, point_share)
+        )
+        # Cell-center distances as produced by vtkDistancePolyDataFilter.
+        cell_distances = _vtk_point_distances(
+            src.cell_centers().points,
+            tgt,
+            _should_abort,
+            _rescaled(_report, "query", point_share, 1.0),
+        )
+        _report("wrap", 0.0)
+        result = _wrap_point_distances(src, distances)
+        result.cell_data['Distance'] = cell_distances
+        # The label reports vertex distances on every path, cached or not.
+        distances = result.point_data['Distance']
+        _report("wrap", 1.0)
+        if cache:
+            _store_cached_result(result_key, result)
     except DistanceComputationCancelled:
         raise
     except Exception as exc:  # pragma: no cover - VTK provides detail
-        if aborted["flag"] or _should_abort():
+        if _should_abort():
             logger.info("Distance computation aborted during execution")
             raise DistanceComputationCancelled() from exc
         logger.exception("Distance computation failed")
         raise MeshOperationError(str(exc)) from exc
 
+    return result, _log_distance_range(distances)
+
+
+def _load_cached_result(key: str, src: pv.PolyData) -> Optional[pv.PolyData]:
+    started = time.perf_counter()
+    arrays = _result_disk_cache.load(key)
+    if arrays is None:
+        return None
+    point_distances = arrays["point_distances"]
+    if len(point_distances) != src.n_points:
+        logger.warning("Distance cache entry %s does not match the mesh; ignoring it", key)
+        return None
+    if point_distances.dtype != np.float64:
+        # Entries from older versions were stored in single precision.
+        logger.info("Distance cache entry %s has reduced precision; recomputing", key)
+        return None
+    result = _wrap_point_distances(src, point_distances)
+    if "cell_distances" in arrays and len(arrays["cell_distances"]) == src.n_cells:
+        result.cell_data['Distance'] = arrays["cell_distances"]
+    logger.info(
+        "Distance cache hit for %d points (%.2fs)", src.n_points, time.perf_counter() - started
+    )
+    return result
+
+
+def _store_cached_result(key: str, result: pv.PolyData) -> None:
+    # Full precision, so a cache hit is indistinguishable from a fresh run.
+    arrays = {"point_distances": np.asarray(result.point_data['Distance'], dtype=np.float64)}
+    if 'Distance' in result.cell_data:
+        arrays["cell_distances"] = np.asarray(result.cell_data['Distance'], dtype=np.float64)
+    _result_disk_cache.store(key, arrays)
+
+
+def clear_result_cache() -> None:
+    """Delete every memoized distance result from the runtime cache directory."""
+    _result_disk_cache.clear()
+    logger.info("Cleared the distance result cache")
+
+
+def _budget_reduction(mesh: pv.PolyData, target_points: int) -> Optional[float]:
+    if mesh.n_points <= target_points:
+        return None
+    return 1.0 - target_points / mesh.n_points
+
+
+def _run_abortable(
+    algorithm,
+    should_abort: Optional[Callable[[], bool]],
+    progress: Optional[Callable[[float], None]] = None,
+) -> pv.PolyData:
+    """Update a VTK filter, aborting it from its progress events on request.
+
+    ``progress`` receives the filter's own progress fraction with each event.
+    """
+    if should_abort is not None or progress is not None:
+
+        def _check(caller, _event):
+            if progress is not None:
+                progress(caller.GetProgress())
+            if should_abort is not None and should_abort():
+                caller.AbortExecuteOn()
+
+        algorithm.AddObserver("ProgressEvent", _check)
+    algorithm.Update()
+    if algorithm.GetAbortExecute():
+        raise DistanceComputationCancelled()
+    return pv.wrap(algorithm.GetOutput())
+
+
+def _quadric_decimate(
+    mesh: pv.PolyData,
+    reduction: float,
+    should_abort: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> pv.PolyData:
+    """``pv.PolyData.decimate`` with its defaults, run as an abortable filter."""
+    decimation = vtk.vtkQuadricDecimation()
+    decimation.SetInputData(mesh.triangulate() if not mesh.is_all_triangles else mesh)
+    decimation.SetTargetReduction(reduction)
+    decimation.VolumePreservationOff()
+    decimation.AttributeErrorMetricOff()
+    return _run_abortable(decimation, should_abort, progress)
+
+
+def _cluster_decimate(
+    mesh: pv.PolyData,
+    reduction: float,
+    should_abort: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> pv.PolyData:
+    """Vertex clustering on a grid sized for roughly ``1 - reduction`` of the vertices."""
+    target = max(int(round((1.0 - reduction) * mesh.n_points)), 1)
+    # A surface occupies about area / spacing**2 grid cells; the factor makes
+    # up for cells the surface crosses only partially.
+    spacing = math.sqrt(1.25 * mesh.area / target)
+    bounds = np.asarray(mesh.bounds)
+    divisions = [max(int(math.ceil(extent / spacing)), 1) for extent in bounds[1::2] - bounds[0::2]]
+    clustering = vtk.vtkQuadricClustering()
+    clustering.SetInputData(mesh)
+    clustering.AutoAdjustNumberOfDivisionsOff()
+    clustering.SetNumberOfDivisions(*divisions)
+    return _run_abortable(clustering, should_abort, progress)
+
+
+def decimate_mesh(
+    mesh: pv.PolyData,
+    reduction: float,
+    method: str = DEFAULT_DECIMATION_METHOD,
+    should_abort: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[float], None]] = None,
+    cache: bool = True,
+) -> pv.PolyData:
+    """Decimation memoized per (mesh fingerprint, method, reduction).
+
+    Results live in an in-memory LRU and, when the runtime cache directory is
+    configured, in ``.npz`` files that survive restarts.  The returned mesh
+    is shared between callers and must not be modified in place.
+    ``should_abort`` is polled from the filter's progress events; an aborted
+    run raises :class:`DistanceComputationCancelled` and caches nothing.
+    ``progress`` receives the filter's fractions; cache hits report nothing.
+    With ``cache=False`` both caches are still read but nothing is stored.
+    """
+    fingerprint = mesh_fingerprint(mesh)
+    key = (fingerprint, method, round(float(reduction), 6))
+    cached = _decimation_cache.get(key)
+    if cached is not None:
+        decimated, seconds = cached
+        logger.info(
+            "Decimation cache hit (memory) for %s %.2f: %d -> %d points, saved %.2fs",
+            method,
+            reduction,
+            mesh.n_points,
+            decimated.n_points,
+            seconds,
+        )
+        return decimated
+
+    disk_key = f"{fingerprint}_{method}_{key[2]:.6f}"
+    started = time.perf_counter()
+    arrays = _decimation_disk_cache.load(disk_key)
+    if arrays is not None:
+        decimated = pv.PolyData(arrays["points"], arrays["faces"])
+        seconds = float(arrays["seconds"])
+        logger.info(
+            "Decimation cache hit (disk) for %s %.2f: %d -> %d points, saved %.2fs",
+            method,
+            reduction,
+            mesh.n_points,
+            decimated.n_points,
+            seconds - (time.perf_counter() - started),
+        )
+    else:
+        started = time.perf_counter()
+        if method == "clustering":
+            decimated = _cluster_decimate(mesh, reduction, should_abort, progress)
+        else:
+            decimated = _quadric_decimate(mesh, reduction, should_abort, progress)
+        seconds = time.perf_counter() - started
+        if cache:
+            _decimation_disk_cache.store(
+                disk_key,
+                {
+                    "points": np.asarray(decimated.points),
+                    "faces": np.asarray(decimated.faces),
+                    "seconds": np.float64(seconds),
+                },
+            )
+    if cache:
+        _decimation_cache.put(key, (decimated, seconds), decimated.GetActualMemorySize() * 1024)
+    return decimated
+
+
+def _decimate_pair(
+    src: pv.PolyData,
+    tgt: pv.PolyData,
+    reductions: Tuple[Optional[float], Optional[float]],
+    method: str,
+    should_abort: Callable[[], bool],
+    report: Callable[[str, float], None],
+    cache: bool = True,
+) -> Tuple[pv.PolyData, pv.PolyData]:
+    """Decimate source and target concurrently; VTK filters run without the GIL.
+
+    A ``None`` reduction leaves that mesh unchanged.
+    """
+
+    def _timed(mesh, reduction, stage):
+        started = time.perf_counter()
+        report(stage, 0.0)
+        if reduction is not None:
+            mesh = decimate_mesh(
+                mesh, reduction, method, should_abort, _stage_progress(report, stage), cache
+            )
+        report(stage, 1.0)
+        return mesh, time.perf_counter() - started
+
+    shared = src is tgt and reductions[0] == reductions[1]
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decimate")
+    cancelled = False
+    try:
+        futures = [executor.submit(_timed, src, reductions[0], "decimate_source")]
+        if not shared:
+            futures.append(executor.submit(_timed, tgt, reductions[1], "decimate_target"))
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.02, return_when=FIRST_EXCEPTION)
+            if should_abort():
+                logger.info("Distance computation aborted during decimation")
+                cancelled = True
+                raise DistanceComputationCancelled()
+        if shared:
+            decimated, _ = futures[0].result()
+            report("decimate_target", 1.0)
+            return decimated, decimated
+        (src, src_seconds), (tgt, tgt_seconds) = (future.result() for future in futures)
+    finally:
+        # VTK filters can go a second or more between progress events, so a
+        # cancelled run does not join its threads: each aborts at its next
+        # event and its result is dropped.
+        executor.shutdown(wait=not cancelled, cancel_futures=True)
+    logger.info(
+        "Decimated source and target concurrently in %.2fs (source %.2fs, target %.2fs)",
+        time.perf_counter() - started,
+        src_seconds,
+        tgt_seconds,
+    )
+    return src, tgt
+
+
+class _ImplicitDistance:
+    """Cached vtkImplicitPolyDataDistance; the locator inside is not thread-safe."""
+
+    def __init__(self, mesh: pv.PolyData):
+        self.function = vtk.vtkImplicitPolyDataDistance()
+        self.function.SetInput(mesh)
+        self.lock = threading.Lock()
+        # The function keeps a triangulated copy of the input plus a cell locator.
+        self.nbytes = 2 * mesh.GetActualMemorySize() * 1024
+
+    def evaluate(
+        self,
+        points,
+        should_abort: Callable[[], bool],
+        chunk_size: int,
+        progress: Optional[Callable[[float], None]] = None,
+    ):
+        from app.services.distance_engine import adaptive_chunks
+
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        distances = np.empty(len(points), dtype=np.float64)
+        # Another run may hold the locator for a long evaluation (or its lazy
+        # build); keep honouring cancel while waiting for it.
+        while not self.lock.acquire(timeout=_LOCK_POLL_SECONDS):
+            if should_abort():
+                return None
+        try:
+            for start, stop in adaptive_chunks(len(points), chunk_size):
+                if should_abort():
+                    return None
+                values = vtk.vtkDoubleArray()
+                self.function.FunctionValue(numpy_to_vtk(points[start:stop], deep=False), values)
+                distances[start:stop] = np.abs(vtk_to_numpy(values))
+                if progress is not None:
+                    progress(stop / len(points))
+        finally:
+            self.lock.release()
+        return distances
+
+
+def _cached_locator(
+    tgt: pv.PolyData,
+    kind: str,
+    report: Optional[Callable[[str, float], None]] = None,
+):
+    key = (kind, mesh_fingerprint(tgt))
+    if report is not None:
+        report("locator", 0.0)
+
+    def _build():
+        started = time.perf_counter()
+        if kind == "kdtree":
+            from app.services.distance_engine import TargetIndex
+
+            locator = TargetIndex.from_mesh(tgt)
+        else:
+            locator = _ImplicitDistance(tgt)
+        logger.info("Built %s locator in %.2fs (%d cells)", kind, time.perf_counter() - started, tgt.n_cells)
+        return locator
+
+    locator = locator_cache.get_or_create(key, _build, lambda locator: locator.nbytes)
+    if report is not None:
+        report("locator", 1.0)
+    return locator
+
+
+def _vtk_point_distances(
+    points,
+    tgt: pv.PolyData,
+    should_abort: Callable[[], bool],
+    progress: Optional[Callable[[str, float], None]] = None,
+):
+    started = time.perf_counter()
+    locator = _cached_locator(tgt, "vtk", progress)
+    distances = locator.evaluate(
+        points, should_abort, _VTK_CHUNK_SIZE, _stage_progress(progress, "query")
+    )
+    if distances is None:
+        logger.info("Distance computation aborted during VTK evaluation")
+        raise DistanceComputationCancelled()
+    logger.info(
+        "VTK distance engine: %.2fs (%d target cells, %d points)",
+        time.perf_counter() - started,
+        tgt.n_cells,
+        len(points),
+    )
+    return distances
+
+
+def _kdtree_point_distances(
+    points,
+    tgt: pv.PolyData,
+    should_abort: Callable[[], bool],
+    workers: Optional[int] = None,
+    max_distance: Optional[float] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+):
+    from app.services import distance_engine
+
+    started = time.perf_counter()
+    if workers is not None and workers > 1 and len(points) > distance_engine.DEFAULT_CHUNK_SIZE:
+        # Pool workers build their own index from shared memory and keep it
+        # for later runs against the same target.
+        if progress is not None:
+            progress("locator", 0.0)
+        tgt_points, tgt_faces = distance_engine.triangle_arrays(tgt)
+        if progress is not None:
+            progress("locator", 1.0)
+        distances = distance_engine.compute_point_distances_parallel(
+            tgt_points,
+            tgt_faces,
+            points,
+            workers,
+            should_abort=should_abort,
+            max_distance=max_distance,
+            progress=_stage_progress(progress, "query"),
+            target_key=mesh_fingerprint(tgt),
+        )
+        mode = f"{workers} processes"
+    else:
+        index = _cached_locator(tgt, "kdtree", progress)
+        distances = distance_engine.compute_point_distances(
+            index,
+            points,
+            should_abort=should_abort,
+            max_distance=max_distance,
+            progress=_stage_progress(progress, "query"),
+        )
+        mode = "serial"
+    if distances is None:
+        logger.info("Distance computation aborted during KD-tree query")
+        raise DistanceComputationCancelled()
+    logger.info(
+        "KD-tree distance engine (%s): %.2fs (%d target cells, %d points)",
+        mode,
+        time.perf_counter() - started,
+        tgt.n_cells,
+        len(points),
+    )
+    return distances
+
+
+def _stage_progress(
+    report: Optional[Callable[[str, float], None]], stage: str
+) -> Optional[Callable[[float], None]]:
+    if report is None:
+        return None
+    return lambda fraction: report(stage, fraction)
+
+
+def _rescaled(
+    report: Callable[[str, float], None], stage: str, start: float, stop: float
+) -> Callable[[str, float], None]:
+    """Map ``stage`` fractions onto ``[start, stop]``; other stages pass through."""
+
+    def _report(name: str, fraction: float) -> None:
+        if name == stage:
+            fraction = start + fraction * (stop - start)
+        report(name, fraction)
+
+    return _report
+
+
+def _compute_distance_bounded(
+    src: pv.PolyData,
+    tgt: pv.PolyData,
+    max_distance: float,
+    engine: str,
+    workers: Optional[int],
+    should_abort: Callable[[], bool],
+    report: Callable[[str, float], None],
+) -> pv.PolyData:
+    """Distances clamped to ``max_distance``, with the arrays of the unbounded run.
+
+    Only vertices (and, for the VTK engine, cell centres) outside the
+    target's bounding box by more than the cutoff are skipped here; the box
+    is a conservative test, so the VTK engine still queries everything near
+    the box.  The KD-tree engine prunes further.
+    """
+    if engine == "kdtree":
+        distances = _bounded_distances(
+            src.points,
+            tgt,
+            max_distance,
+            lambda points: _kdtree_point_distances(
+                points, tgt, should_abort, workers, max_distance, report
+            ),
+        )
+        report("wrap", 0.0)
+        result = _wrap_point_distances(src, distances)
+        report("wrap", 1.0)
+        return result
+
+    # Vertices and cell centres, as in the unbounded VTK path.
+    point_share = src.n_points / max(src.n_points + src.n_cells, 1)
+    distances = _bounded_distances(
+        src.points,
+        tgt,
+        max_distance,
+        lambda points: _vtk_point_distances(
+            points, tgt, should_abort, _rescaled(report, "query", 0.0, point_share)
+        ),
+    )
+    cell_distances = _bounded_distances(
+        src.cell_centers().points,
+        tgt,
+        max_distance,
+        lambda points: _vtk_point_distances(
+            points, tgt, should_abort, _rescaled(report, "query", point_share, 1.0)
+        ),
+    )
+    report("wrap", 0.0)
+    result = _wrap_point_distances(src, distances)
+    result.cell_data['Distance'] = cell_distances
+    report("wrap", 1.0)
+    return result
+
+
+def _bounded_distances(points, tgt: pv.PolyData, max_distance: float, query) -> np.ndarray:
+    """``query`` the points near the target's bounds; clamp everything to ``max_distance``."""
+    from app.services.distance_engine import points_beyond_bounds
+
+    points = np.asarray(points)
+    candidates = np.flatnonzero(~points_beyond_bounds(points, tgt.bounds, max_distance))
+    distances = np.full(len(points), max_distance, dtype=np.float64)
+    if len(candidates):
+        distances[candidates] = np.minimum(query(points[candidates]), max_distance)
+    logger.info(
+        "Bounded distance search: %d of %d points beyond the target bounds + %.2f mm",
+        len(points) - len(candidates),
+        len(points),
+        max_distance,
+    )
+    return distances
+
+
+def _wrap_point_distances(src: pv.PolyData, distances) -> pv.PolyData:
+    result = pv.PolyData()
+    result.shallow_copy(src)
+    result.point_data['Distance'] = distances
+    return result
+
+
+def _scipy_available() -> bool:
+    try:
+        import scipy.spatial  # noqa: F401
+    except ImportError:  # pragma: no cover - SciPy is excluded from frozen builds
+        return False
+    return True
+
+
+def _log_distance_range(distances, max_distance: Optional[float] = None) -> Optional[float]:
     min_distance: Optional[float] = None
     if distances is not None and len(distances) > 0:
         min_distance = float(distances.min())
-        max_distance = float(distances.max())
+        max_value = float(distances.max())
         logger.info(
             "Distance computed; min=%.4f max=%.4f (points=%d)",
             min_distance,
-            max_distance,
+            max_value,
             len(distances),
         )
+        if max_distance is not None and min_distance >= max_distance:
+            logger.info("No source vertex within %.2f mm of the target", max_distance)
+            min_distance = None
     else:
         logger.warning("Distance result missing scalars")
 
-    return result, min_distance
+    return min_distance
+
+
+class DistanceColormap:
+    """Immutable joint-space color scale: stops, scalar range and a uint8 RGB table.
+
+    Built once per color spec by :func:`distance_colormap` and shared; the
+    table is read-only, and :meth:`lookup_table` hands out independent VTK
+    tables so renderers cannot alter the shared object.
+    """
+
+    def __init__(self, color_points, scalar_range, n_values: int = 256):
+        self.color_points = tuple(color_points)
+        self.scalar_range = (float(scalar_range[0]), float(scalar_range[1]))
+        self.rgb_table = _interpolate_color_table(self.color_points, self.scalar_range, n_values)
+        self.rgb_table.setflags(write=False)
+
+    @property
+    def n_values(self) -> int:
+        return len(self.rgb_table)
+
+    def lookup_table(self, nan_rgb=UNCOMPUTED_RGB) -> pv.LookupTable:
+        """A new ``pv.LookupTable`` filled from :attr:`rgb_table` (no matplotlib)."""
+        rgba = np.empty((self.n_values, 4), dtype=np.uint8)
+        rgba[:, :3] = self.rgb_table
+        rgba[:, 3] = 255
+        lut = pv.LookupTable()
+        lut.values = rgba
+        lut.scalar_range = self.scalar_range
+        lut.nan_color = tuple(channel / 255.0 for channel in nan_rgb)
+        return lut
+
+
+def _interpolate_color_table(color_points, scalar_range, n_values: int) -> np.ndarray:
+    """Sample the piecewise-linear color stops like matplotlib's
+    ``LinearSegmentedColormap.from_list(...)(np.arange(n_values))``."""
+    rng_min, rng_max = scalar_range
+    x = np.array([(value - rng_min) / (rng_max - rng_min) for value, _ in color_points])
+    y = np.array([rgb for _, rgb in color_points], dtype=np.float64)
+    xind = np.linspace(0, 1, n_values)
+    ind = np.searchsorted(x, xind)[1:-1]
+    distance = (xind[1:-1] - x[ind - 1]) / (x[ind] - x[ind - 1])
+    rgb = np.concatenate(
+        [y[:1], distance[:, None] * (y[ind] - y[ind - 1]) + y[ind - 1], y[-1:]]
+    )
+    np.clip(rgb, 0.0, 1.0, out=rgb)
+    return (rgb * 255).astype(np.uint8)
+
+
+DISTANCE_COLOR_POINTS = (
+    (0.0, (1.0, 0.0, 0.0)),
+    (1.0, (1.0, 0.0, 0.0)),
+    (1.6, (1.0, 1.0, 0.0)),
+    (2.5, (0.0, 1.0, 0.0)),
+    (3.3, (0.0, 1.0, 1.0)),
+    (4.0, (0.0, 0.0, 1.0)),
+    (5.0, (0.0, 0.0, 1.0)),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def distance_colormap(
+    color_points=DISTANCE_COLOR_POINTS, max_distance: float = COLORMAP_MAX_DISTANCE
+) -> DistanceColormap:
+    """The shared colormap for a color spec; a different spec gets its own entry."""
+    colormap = DistanceColormap(color_points, (0.0, max_distance))
+    logger.debug("Built distance colormap with range %s", colormap.scalar_range)
+    return colormap
 
 
 def create_custom_colormap() -> pv.LookupTable:
     """Construct a smooth lookup table matching the joint-space color spec."""
-    from matplotlib.colors import LinearSegmentedColormap
-
-    color_points = [
-        (0.0, (1.0, 0.0, 0.0)),
-        (1.0, (1.0, 0.0, 0.0)),
-        (1.6, (1.0, 1.0, 0.0)),
-        (2.5, (0.0, 1.0, 0.0)),
-        (3.3, (0.0, 1.0, 1.0)),
-        (4.0, (0.0, 0.0, 1.0)),
-        (5.0, (0.0, 0.0, 1.0)),
-    ]
-    positions = [value / 5.0 for value, _ in color_points]
-    colors = [rgb for _, rgb in color_points]
-    cmap = LinearSegmentedColormap.from_list(
-        "jointspace", list(zip(positions, colors))
-    )
-    lut = pv.LookupTable()
-    lut.apply_cmap(cmap, n_values=256)
-    lut.scalar_range = (0.0, 5.0)
-    logger.debug("Created custom lookup table with range %s", lut.scalar_range)
-    return lut
+    return distance_colormap().lookup_table()
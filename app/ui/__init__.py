@@ -1,5 +1,13 @@
 """UI package for Joint Space Visualizer."""
 
-from .main_window import JointSpaceVisualizerApp
-
 __all__ = ["JointSpaceVisualizerApp"]
+
+
+def __getattr__(name):
+    # Imported lazily so the Qt-free helper modules can be used (and tested)
+    # without PyQt5.
+    if name == "JointSpaceVisualizerApp":
+        from .main_window import JointSpaceVisualizerApp
+
+        return JointSpaceVisualizerApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,18 +5,37 @@ from functools import partial
 
 import numpy as np
 import pyvista as pv
-from matplotlib.image import imsave
 from PyQt5 import QtCore, QtGui, QtWidgets
 from pyvistaqt import QtInteractor
 
 from app.services import (
+    COLORMAP_MAX_DISTANCE,
+    DEFAULT_DECIMATION_METHOD,
+    DEFAULT_DISTANCE_ENGINE,
     MeshOperationError,
-    create_custom_colormap as build_colormap,
-    load_mesh,
+    cache_stats,
+    clear_result_cache,
+    distance_colormap,
+    mesh_buffers,
+    overlap_bounds,
+    replace_distance_scalars,
     save_colored_mesh,
     save_mesh,
+    shared_copy,
+)
+from app.ui.render_pacing import FrameCoalescer
+from app.ui.session_rendering import resume_session, suspend_session
+from app.ui.workers import (
+    DEFAULT_MAX_CONCURRENT_JOBS,
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_FINISHED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    DistanceJobScheduler,
+    LodProxyBuilder,
+    MeshLoader,
 )
-from app.ui.workers import DistanceComputationWorker
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +48,24 @@ _CREATE_LIGHTS = (
     {"position": (-6, -6, -12), "intensity": 0.16},
 )
 
+# 距離計算の各段階の表示名
+_DISTANCE_STAGE_LABELS = {
+    "decimate_source": "下顎骨モデルのデシメーション",
+    "decimate_target": "上顎骨モデルのデシメーション",
+    "locator": "探索構造の構築",
+    "query": "距離計算",
+    "wrap": "結果の作成",
+}
+
+# ジョブ一覧の状態表示
+_JOB_STATE_LABELS = {
+    JOB_QUEUED: "待機中",
+    JOB_RUNNING: "実行中",
+    JOB_FINISHED: "完了",
+    JOB_FAILED: "失敗",
+    JOB_CANCELLED: "中止",
+}
+
 _COMPARE_LIGHTS = (
     {"position": (0, 8, 16), "intensity": 0.24},
     {"position": (0, -8, -16), "intensity": 0.18},
@@ -105,30 +142,103 @@ class HeadlessPlotter:
 
     def link_views(self, *args, **kwargs):
         pass
+
+
+def _display_frame_interval():
+    """Seconds per frame of the primary screen (60 Hz when unknown)."""
+    screen = QtGui.QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0.0
+    if not rate or not math.isfinite(rate) or rate < 1.0:
+        rate = 60.0
+    return 1.0 / rate
+
+
+class _RenderScheduler(QtCore.QObject):
+    """Coalesces interactive redraws to at most one per display frame per plotter.
+
+    A single-shot timer paces the frames; which plotters and preparation
+    callbacks go into each one is tracked by :class:`FrameCoalescer`.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frames = FrameCoalescer(_display_frame_interval())
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._render_frame)
+
+    def request(self, plotters, prepare=None):
+        wait = self._frames.request(plotters, prepare)
+        if wait is not None:
+            self._timer.start(int(math.ceil(wait * 1000)))
+
+    def forget(self, plotter):
+        self._frames.forget(plotter)
+
+    def stats(self):
+        return self._frames.stats()
+
+    def _render_frame(self):
+        prepare, plotters = self._frames.take_frame()
+        for callback in prepare:
+            try:
+                callback()
+            except Exception:
+                logger.debug("Render preparation failed", exc_info=True)
+        for plotter in plotters:
+            try:
+                plotter.renderer.ResetCameraClippingRange()
+                plotter.render()
+            except Exception:
+                continue
+            self._frames.renders += 1
+
+
 class _ViewportEventFilter(QtCore.QObject):
-    def __init__(self, plotter):
+    # True when a mouse drag starts moving the camera, False when it ends.
+    dragging_changed = QtCore.pyqtSignal(bool)
+
+    def __init__(self, plotter, scheduler):
         super().__init__()
         self._plotters = [plotter]
+        self._scheduler = scheduler
         self._dragging = False
         self._drag_mode = None
         self._last_pos = None
+        self._passthrough = False
+        # Camera motion accumulated since the last frame.
+        self._pending_orbit = [0, 0]
+        self._pending_pan = [0, 0]
+        self._pending_zoom = 1.0
+
+    @property
+    def plotters(self):
+        return list(self._plotters)
 
     def set_linked_plotters(self, plotters):
         if plotters:
             self._plotters = list(plotters)
 
+    def set_passthrough(self, enabled):
+        # VTK widgets (e.g. the ROI box) need the raw mouse events.
+        self._passthrough = bool(enabled)
+        if self._dragging:
+            self.dragging_changed.emit(False)
+        self._dragging = False
+        self._drag_mode = None
+        self._last_pos = None
+
     def eventFilter(self, obj, event):
+        if self._passthrough:
+            return False
         etype = event.type()
         if etype == QtCore.QEvent.MouseButtonPress:
             if event.button() == QtCore.Qt.LeftButton:
-                self._dragging = True
-                self._drag_mode = 'orbit'
-                self._last_pos = event.pos()
+                self._start_drag('orbit', event.pos())
                 return True
             if event.button() == QtCore.Qt.RightButton:
-                self._dragging = True
-                self._drag_mode = 'pan'
-                self._last_pos = event.pos()
+                self._start_drag('pan', event.pos())
                 return True
         if etype == QtCore.QEvent.MouseMove:
             if self._dragging:
@@ -138,16 +248,23 @@ class _ViewportEventFilter(QtCore.QObject):
                     dy = current.y() - self._last_pos.y()
                     if dx or dy:
                         if self._drag_mode == 'orbit':
-                            self._apply_orbit(dx, dy)
+                            self._pending_orbit[0] += dx
+                            self._pending_orbit[1] += dy
+                            self._schedule()
                         elif self._drag_mode == 'pan':
-                            self._apply_pan(dx, dy)
+                            self._pending_pan[0] += dx
+                            self._pending_pan[1] += dy
+                            self._schedule()
                 self._last_pos = current
             return True
         if etype == QtCore.QEvent.MouseButtonRelease:
             if event.button() in (QtCore.Qt.LeftButton, QtCore.Qt.RightButton):
+                was_dragging = self._dragging
                 self._dragging = False
                 self._drag_mode = None
                 self._last_pos = None
+                if was_dragging:
+                    self.dragging_changed.emit(False)
                 return True
         if etype == QtCore.QEvent.Wheel:
             delta = event.angleDelta().y()
@@ -155,15 +272,24 @@ class _ViewportEventFilter(QtCore.QObject):
                 step = max(abs(delta) / 240.0, 0.1)
                 factor = 1.0 + step
                 if delta > 0:
-                    self._apply_zoom(factor)
+                    self._queue_zoom(factor)
                 else:
-                    self._apply_zoom(1.0 / factor)
+                    self._queue_zoom(1.0 / factor)
                 return True
         return False
 
-    def _apply_zoom(self, factor):
-        if not self._plotters:
-            return
+    def _start_drag(self, mode, pos):
+        was_dragging = self._dragging
+        self._dragging = True
+        self._drag_mode = mode
+        self._last_pos = pos
+        if not was_dragging:
+            self.dragging_changed.emit(True)
+
+    def _schedule(self):
+        self._scheduler.request(self._plotters, prepare=self._apply_pending)
+
+    def _queue_zoom(self, factor):
         if not isinstance(factor, (int, float)):
             return
         if not math.isfinite(factor) or factor <= 0:
@@ -174,57 +300,43 @@ class _ViewportEventFilter(QtCore.QObject):
             factor = min(factor, max_step)
         else:
             factor = max(factor, min_step)
-        primary = self._plotters[0]
-        camera = getattr(primary, 'camera', None)
-        renderer = getattr(primary, 'renderer', None)
-        if camera is None or renderer is None:
+        self._pending_zoom *= factor
+        self._schedule()
+
+    def _apply_pending(self):
+        """Apply the motion accumulated since the last frame to the shared camera."""
+        zoom, self._pending_zoom = self._pending_zoom, 1.0
+        (orbit_dx, orbit_dy), self._pending_orbit = self._pending_orbit, [0, 0]
+        (pan_dx, pan_dy), self._pending_pan = self._pending_pan, [0, 0]
+        if not self._plotters:
+            return
+        camera = getattr(self._plotters[0], 'camera', None)
+        if camera is None:
             return
+        if zoom != 1.0:
+            self._apply_zoom(camera, zoom)
+        if orbit_dx or orbit_dy:
+            self._apply_orbit(camera, orbit_dx, orbit_dy)
+        if pan_dx or pan_dy:
+            self._apply_pan(camera, pan_dx, pan_dy)
+
+    def _apply_zoom(self, camera, factor):
         try:
             camera.Dolly(factor)
-            renderer.ResetCameraClippingRange()
-            primary.render()
         except Exception:
             return
-        for plotter in self._plotters[1:]:
-            try:
-                plotter.renderer.ResetCameraClippingRange()
-                plotter.render()
-            except Exception:
-                pass
 
-    def _apply_orbit(self, dx, dy):
-        if not self._plotters or (dx == 0 and dy == 0):
-            return
-        primary = self._plotters[0]
-        camera = getattr(primary, 'camera', None)
-        renderer = getattr(primary, 'renderer', None)
-        if camera is None or renderer is None:
-            return
+    def _apply_orbit(self, camera, dx, dy):
         azimuth = -dx * 0.4
         elevation = dy * 0.4
         try:
             camera.Azimuth(azimuth)
             camera.Elevation(elevation)
             camera.OrthogonalizeViewUp()
-            renderer.ResetCameraClippingRange()
-            primary.render()
         except Exception:
             return
-        for plotter in self._plotters[1:]:
-            try:
-                plotter.renderer.ResetCameraClippingRange()
-                plotter.render()
-            except Exception:
-                pass
 
-    def _apply_pan(self, dx, dy):
-        if not self._plotters or (dx == 0 and dy == 0):
-            return
-        primary = self._plotters[0]
-        camera = getattr(primary, 'camera', None)
-        renderer = getattr(primary, 'renderer', None)
-        if camera is None or renderer is None:
-            return
+    def _apply_pan(self, camera, dx, dy):
         try:
             focal = np.array(camera.focal_point)
             position = np.array(camera.position)
@@ -247,16 +359,9 @@ class _ViewportEventFilter(QtCore.QObject):
             new_position = position + translation
             camera.focal_point = new_focal.tolist()
             camera.position = new_position.tolist()
-            renderer.ResetCameraClippingRange()
-            primary.render()
         except Exception:
             return
-        for plotter in self._plotters[1:]:
-            try:
-                plotter.renderer.ResetCameraClippingRange()
-                plotter.render()
-            except Exception:
-                pass
+
 
 class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
     def __init__(self):
@@ -266,15 +371,22 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
 
         # セッション（タブ）ごとの状態を保持（作成タブ内）
         self.sessions = []  # list of dicts: { 'plotter': QtInteractor, 'models': {} }
-        self._distance_thread = None
-        self._distance_worker = None
-        self._is_busy = False
+        self._jobs = DistanceJobScheduler(DEFAULT_MAX_CONCURRENT_JOBS, parent=self)
+        self._loader = MeshLoader(parent=self)
+        self._lod_builder = LodProxyBuilder(parent=self)
+        self._lod_builder.built.connect(self._on_lod_proxy_built)
+        # (plotter, actor name) -> [full mesh, LOD proxy or None]
+        self._lod_meshes = {}
+        # (plotter, actor name) -> (actor, full-resolution mapper input) while dragging
+        self._lod_swapped = {}
+        # 比較パネルごとの最新の読み込み要求（古い結果は破棄）
+        self._compare_requests = {}
         self._event_filters = []
+        self._render_scheduler = _RenderScheduler(self)
         self._plotter_brightness = {}
         self._plotter_is_compare = {}
-        self._pending_cancel = False
         self._log_path = self._resolve_log_path()
-        self._cancel_watchdog = None
+        self._roi_box_plotter = None
         self.headless_mode = bool(os.environ.get("JSV_HEADLESS"))
         self.setup_ui()
         self.connect_signals()
@@ -284,6 +396,12 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
 
     def setup_ui(self):
         self.status_bar = self.statusBar()
+        self.distance_progress_bar = QtWidgets.QProgressBar()
+        self.distance_progress_bar.setRange(0, 100)
+        self.distance_progress_bar.setMaximumWidth(360)
+        self.distance_progress_bar.setTextVisible(True)
+        self.distance_progress_bar.hide()
+        self.status_bar.addPermanentWidget(self.distance_progress_bar)
         # --- 上位タブ（作成 / 比較） ---
         self.main_tabs = QtWidgets.QTabWidget()
         self.setCentralWidget(self.main_tabs)
@@ -365,6 +483,32 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.debug_status_label.setStyleSheet("color: #777; font-size: 11px;")
         debug_layout.addWidget(self.debug_status_label)
 
+        self.cache_stats_label = QtWidgets.QLabel()
+        self.cache_stats_label.setStyleSheet("color: #777; font-size: 11px;")
+        debug_layout.addWidget(self.cache_stats_label)
+
+        self.session_memory_label = QtWidgets.QLabel()
+        self.session_memory_label.setStyleSheet("color: #777; font-size: 11px;")
+        debug_layout.addWidget(self.session_memory_label)
+
+        self.render_stats_label = QtWidgets.QLabel()
+        self.render_stats_label.setStyleSheet("color: #777; font-size: 11px;")
+        debug_layout.addWidget(self.render_stats_label)
+
+        cache_row = QtWidgets.QHBoxLayout()
+        self.clear_result_cache_button = QtWidgets.QPushButton("距離結果キャッシュを削除")
+        self.clear_result_cache_button.setToolTip("ディスクに保存された過去の距離計算結果を削除します")
+        cache_row.addWidget(self.clear_result_cache_button)
+        cache_row.addStretch(1)
+        debug_layout.addLayout(cache_row)
+
+        self.release_hidden_checkbox = QtWidgets.QCheckBox("非表示セッションの GPU リソースを解放")
+        self.release_hidden_checkbox.setChecked(True)
+        self.release_hidden_checkbox.setToolTip(
+            "表示していないセッションタブの描画を止め、GPU 上のメッシュやシェーダーを解放します（タブを開くと再構築）"
+        )
+        debug_layout.addWidget(self.release_hidden_checkbox)
+
         self.main_tabs.addTab(self.debug_root, "デバッグ")
 
         # === 作成タブのUI ===
@@ -410,30 +554,147 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.apply_button.setStyleSheet("font-weight: bold; padding: 5px;")
         self.cancel_button = QtWidgets.QPushButton("中止")
         self.cancel_button.setEnabled(False)
+        self.cancel_button.setToolTip("このセッションの待機中・実行中のジョブを中止します")
+        self.priority_combo = QtWidgets.QComboBox()
+        self.priority_combo.addItem("優先度: 高", 1)
+        self.priority_combo.addItem("優先度: 通常", 0)
+        self.priority_combo.addItem("優先度: 低", -1)
+        self.priority_combo.setCurrentIndex(1)
         apply_row.addWidget(self.apply_button)
         apply_row.addWidget(self.cancel_button)
+        apply_row.addWidget(self.priority_combo)
         apply_row.addStretch(1)
         self.control_layout.addLayout(apply_row)
-        apply_note = QtWidgets.QLabel("処理には時間がかかります。処理時間はPCのスペックに依存します。")
+        apply_note = QtWidgets.QLabel(
+            "処理には時間がかかります。処理時間はPCのスペックに依存します。"
+            "計算中も別のセッションで Apply するとジョブとして順番に実行されます。"
+        )
         apply_note.setWordWrap(True)
         apply_note.setStyleSheet("color: #555; font-size: 11px;")
         self.control_layout.addWidget(apply_note)
 
+        # Jobs
+        jobs_group = QtWidgets.QGroupBox("ジョブ")
+        jobs_layout = QtWidgets.QVBoxLayout(jobs_group)
+        self.jobs_table = QtWidgets.QTableWidget(0, 4)
+        self.jobs_table.setHorizontalHeaderLabels(["セッション", "内容", "状態", "進捗"])
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.horizontalHeader().setStretchLastSection(True)
+        self.jobs_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.jobs_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.jobs_table.setMaximumHeight(130)
+        jobs_layout.addWidget(self.jobs_table)
+        jobs_row = QtWidgets.QHBoxLayout()
+        self.cancel_job_button = QtWidgets.QPushButton("選択を中止")
+        self.clear_jobs_button = QtWidgets.QPushButton("完了分を消去")
+        self.max_jobs_spin = QtWidgets.QSpinBox()
+        self.max_jobs_spin.setRange(1, 4)
+        self.max_jobs_spin.setValue(DEFAULT_MAX_CONCURRENT_JOBS)
+        self.max_jobs_spin.setPrefix("同時実行: ")
+        jobs_row.addWidget(self.cancel_job_button)
+        jobs_row.addWidget(self.clear_jobs_button)
+        jobs_row.addWidget(self.max_jobs_spin)
+        jobs_layout.addLayout(jobs_row)
+        self.control_layout.addWidget(jobs_group)
+
         # Decimation Group
         self.decimation_group = QtWidgets.QGroupBox("Decimation Options")
         self.decimation_group.setCheckable(True)
         self.decimation_group.setChecked(False)
         decimation_layout = QtWidgets.QFormLayout(self.decimation_group)
+        self.decimation_mode_combo = QtWidgets.QComboBox()
+        self.decimation_mode_combo.addItem("削減率", "ratio")
+        self.decimation_mode_combo.addItem("頂点数上限", "budget")
+        decimation_layout.addRow("Mode:", self.decimation_mode_combo)
         self.decimation_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.decimation_slider.setRange(0, 99)
         self.decimation_slider.setValue(90)
         decimation_layout.addRow("Target Reduction (%):", self.decimation_slider)
+        self.target_points_spin = QtWidgets.QSpinBox()
+        self.target_points_spin.setRange(10000, 5000000)
+        self.target_points_spin.setSingleStep(10000)
+        self.target_points_spin.setValue(200000)
+        self.target_points_spin.setGroupSeparatorShown(True)
+        self.target_points_spin.setToolTip("各モデルをこの頂点数以下に間引きます（既に少ないモデルはそのまま）")
+        decimation_layout.addRow("Target Vertices:", self.target_points_spin)
+        self.decimation_method_combo = QtWidgets.QComboBox()
+        self.decimation_method_combo.addItem("Quadric（高品質）", "quadric")
+        self.decimation_method_combo.addItem("Clustering（高速・プレビュー向け）", "clustering")
+        self.decimation_method_combo.setCurrentIndex(
+            max(self.decimation_method_combo.findData(DEFAULT_DECIMATION_METHOD), 0)
+        )
+        decimation_layout.addRow("Method:", self.decimation_method_combo)
+        self._update_decimation_mode()
         decimation_note = QtWidgets.QLabel("値（％）を下げるほど頂点数が減り、荒くなりますが処理時間は短くなる傾向があります。")
         decimation_note.setWordWrap(True)
         decimation_note.setStyleSheet("color: #555; font-size: 11px;")
         decimation_layout.addRow(decimation_note)
         self.control_layout.addWidget(self.decimation_group)
 
+        # Compute Group
+        self.compute_group = QtWidgets.QGroupBox("Compute Options")
+        compute_layout = QtWidgets.QFormLayout(self.compute_group)
+        self.engine_combo = QtWidgets.QComboBox()
+        self.engine_combo.addItem("VTK (vtkImplicitPolyDataDistance)", "vtk")
+        self.engine_combo.addItem("KD-tree (NumPy/SciPy)", "kdtree")
+        self.engine_combo.setCurrentIndex(max(self.engine_combo.findData(DEFAULT_DISTANCE_ENGINE), 0))
+        compute_layout.addRow("Distance Engine:", self.engine_combo)
+        self.workers_spin = QtWidgets.QSpinBox()
+        self.workers_spin.setRange(1, max(os.cpu_count() or 1, 1))
+        self.workers_spin.setValue(1)
+        self.workers_spin.setToolTip("KD-tree エンジンで距離計算に使うプロセス数")
+        compute_layout.addRow("Workers:", self.workers_spin)
+        self.bounded_checkbox = QtWidgets.QCheckBox(
+            f"{COLORMAP_MAX_DISTANCE:.0f} mm を超える距離は計算を省略"
+        )
+        self.bounded_checkbox.setToolTip(
+            "距離はカラースケール上限で打ち切ります。ターゲットの外接箱から上限以上離れた頂点"
+            "（KD-tree では近くにターゲット頂点がない頂点も）は距離計算を省略します"
+        )
+        compute_layout.addRow(self.bounded_checkbox)
+        self.progressive_checkbox = QtWidgets.QCheckBox("低解像度のプレビューから段階的に表示")
+        self.progressive_checkbox.setToolTip(
+            "粗い結果を先に表示し、計算が進むにつれて置き換えます。中止しても最後のプレビューは残ります"
+        )
+        compute_layout.addRow(self.progressive_checkbox)
+        self.isolated_checkbox = QtWidgets.QCheckBox("別プロセスで計算")
+        self.isolated_checkbox.setToolTip(
+            "距離計算を子プロセスで実行します。中止すると即座に終了し、計算に使ったメモリは解放されます。"
+            "起動に数秒かかり、メモリ上のキャッシュは利用されません。KD-tree は 1 プロセスで計算します"
+        )
+        compute_layout.addRow(self.isolated_checkbox)
+        engine_note = QtWidgets.QLabel(
+            "KD-tree は大きなメッシュで高速です。Workers を 2 以上にすると複数コアで並列計算します。"
+            "SciPy が無い環境では VTK で計算します。"
+        )
+        engine_note.setWordWrap(True)
+        engine_note.setStyleSheet("color: #555; font-size: 11px;")
+        compute_layout.addRow(engine_note)
+        self.control_layout.addWidget(self.compute_group)
+
+        # ROI Group
+        self.roi_group = QtWidgets.QGroupBox("Region of Interest")
+        self.roi_group.setCheckable(True)
+        self.roi_group.setChecked(False)
+        roi_layout = QtWidgets.QVBoxLayout(self.roi_group)
+        self.roi_auto_radio = QtWidgets.QRadioButton(
+            f"自動（両モデルの重なり領域 + {COLORMAP_MAX_DISTANCE:.0f} mm）"
+        )
+        self.roi_auto_radio.setChecked(True)
+        self.roi_box_radio = QtWidgets.QRadioButton("ボックス指定")
+        self.roi_edit_button = QtWidgets.QPushButton("ボックスを編集")
+        self.roi_edit_button.setCheckable(True)
+        roi_layout.addWidget(self.roi_auto_radio)
+        roi_box_row = QtWidgets.QHBoxLayout()
+        roi_box_row.addWidget(self.roi_box_radio)
+        roi_box_row.addWidget(self.roi_edit_button)
+        roi_layout.addLayout(roi_box_row)
+        roi_note = QtWidgets.QLabel("ROI 外の頂点は距離を計算せず、灰色で表示されます。")
+        roi_note.setWordWrap(True)
+        roi_note.setStyleSheet("color: #555; font-size: 11px;")
+        roi_layout.addWidget(roi_note)
+        self.control_layout.addWidget(self.roi_group)
+
         # Display Group
         display_group = QtWidgets.QGroupBox("Display")
         display_layout = QtWidgets.QFormLayout(display_group)
@@ -582,8 +843,9 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self._plotter_is_compare[plotter] = for_compare
         self._configure_plotter_lighting(plotter, compare=for_compare)
         interactor = plotter.interactor
-        event_filter = _ViewportEventFilter(plotter)
+        event_filter = _ViewportEventFilter(plotter, self._render_scheduler)
         interactor.installEventFilter(event_filter)
+        event_filter.dragging_changed.connect(partial(self._on_viewport_dragging, event_filter))
         setattr(plotter, "_viewport_event_filter", event_filter)
         self._event_filters.append(event_filter)
         return plotter
@@ -674,6 +936,9 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.target_load_button.clicked.connect(lambda: self.load_model(self.target_combo, "target"))
         self.source_load_button.clicked.connect(lambda: self.load_model(self.source_combo, "source"))
         self.apply_button.clicked.connect(self.on_apply)
+        self.roi_edit_button.toggled.connect(self.toggle_roi_box)
+        self.decimation_mode_combo.currentIndexChanged.connect(self._update_decimation_mode)
+        self.isolated_checkbox.toggled.connect(lambda *_: self._refresh_controls_enabled())
 
         # Display controls
         self.result_visibility_checkbox.toggled.connect(lambda checked: self.set_actor_visibility("result", checked))
@@ -690,6 +955,18 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.save_screenshot_button.clicked.connect(self.save_screenshot)
         self.new_snapshot_button.clicked.connect(lambda: self.add_new_session(copy_from=self.current_session()))
         self.cancel_button.clicked.connect(self.cancel_distance)
+        self.cancel_job_button.clicked.connect(self.cancel_selected_job)
+        self.clear_jobs_button.clicked.connect(self.clear_finished_jobs)
+        self.max_jobs_spin.valueChanged.connect(self._jobs.set_max_concurrent)
+        self._jobs.job_added.connect(self.on_job_changed)
+        self._jobs.job_changed.connect(self.on_job_changed)
+        self._jobs.job_progress.connect(self.on_job_progress)
+        self._jobs.job_preview.connect(self.on_job_preview)
+        self._jobs.job_finished.connect(self.on_job_finished)
+        self._jobs.job_failed.connect(self.on_job_failed)
+        self._jobs.job_cancelled.connect(self.on_job_cancelled)
+        self._loader.loaded.connect(self.on_mesh_loaded)
+        self._loader.failed.connect(self.on_mesh_load_failed)
 
         # 作成タブ内のセッションタブ操作
         self.session_tabs.currentChanged.connect(self.on_tab_changed)
@@ -710,23 +987,8 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.disclaimer_checkbox.toggled.connect(self._update_disclaimer_state)
         self.debug_refresh_button.clicked.connect(self._refresh_debug_console)
         self.debug_clear_button.clicked.connect(self._clear_debug_console)
-
-    def set_busy_state(self, busy, message=None):
-        if busy == self._is_busy:
-            if busy and message:
-                self.status_bar.showMessage(message)
-            return
-
-        self._is_busy = busy
-        self._refresh_controls_enabled()
-
-        if busy:
-            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-            if message:
-                self.status_bar.showMessage(message)
-        else:
-            QtWidgets.QApplication.restoreOverrideCursor()
-            self.status_bar.clearMessage()
+        self.clear_result_cache_button.clicked.connect(self._clear_result_cache)
+        self.release_hidden_checkbox.toggled.connect(self._apply_session_visibility)
 
     def adjust_zoom(self, factor):
         if self.headless_mode:
@@ -799,6 +1061,8 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
             img_array = np.asarray(img)
             if np.issubdtype(img_array.dtype, np.floating):
                 img_array = np.clip(img_array, 0.0, 255.0).astype(np.uint8)
+            from matplotlib.image import imsave
+
             imsave(file_path, img_array)
             logger.info("Screenshot saved to %s", file_path)
         except Exception as e:
@@ -919,15 +1183,17 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         if distances is None:
             actor = plotter.add_mesh(mesh, name=name, **common_kwargs)
             self._apply_surface_properties(actor)
+            self._request_lod_proxy(plotter, name, mesh)
             plotter.renderer.ResetCameraClippingRange()
             plotter.render()
             return
-        lut = self.create_custom_colormap()
+        # A fresh VTK table from the shared colormap; range and NaN color
+        # are already set on it, and matplotlib is never imported.
         kwargs = {
             'name': name,
-            'scalars': distances,
-            'cmap': lut.cmap,
-            'clim': lut.scalar_range,
+            # By name, so an LOD proxy carrying the same array colors alike.
+            'scalars': 'Distance',
+            'cmap': distance_colormap().lookup_table(),
             'scalar_bar_args': {'title': 'Distance (mm)'},
         }
         if assoc == 'cell':
@@ -935,9 +1201,64 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         kwargs.update(common_kwargs)
         actor = plotter.add_mesh(mesh, **kwargs)
         self._apply_surface_properties(actor)
+        self._request_lod_proxy(plotter, name, mesh)
         plotter.renderer.ResetCameraClippingRange()
         plotter.render()
 
+    # --- 操作中の簡略表示（LOD） ---
+    def _request_lod_proxy(self, plotter, name, mesh):
+        if self.headless_mode:
+            return
+        key = (plotter, name)
+        self._lod_meshes[key] = [mesh, None]
+        self._lod_builder.build(key, mesh)
+
+    def _forget_lod_proxies(self, plotter, name=None):
+        for key in list(self._lod_meshes):
+            if key[0] is plotter and (name is None or key[1] == name):
+                del self._lod_meshes[key]
+
+    def _on_lod_proxy_built(self, key, mesh, proxy):
+        entry = self._lod_meshes.get(key)
+        if entry is None or entry[0] is not mesh:
+            # The actor was replaced or removed while the proxy was built.
+            return
+        if proxy is None:
+            del self._lod_meshes[key]
+            return
+        entry[1] = proxy
+
+    def _on_viewport_dragging(self, event_filter, dragging):
+        for plotter in event_filter.plotters:
+            if dragging:
+                self._swap_in_lod_proxies(plotter)
+            else:
+                self._restore_full_resolution(plotter)
+
+    def _swap_in_lod_proxies(self, plotter):
+        actors = getattr(plotter, 'actors', {})
+        for (owner, name), (_, proxy) in self._lod_meshes.items():
+            if owner is not plotter or proxy is None or (owner, name) in self._lod_swapped:
+                continue
+            actor = actors.get(name)
+            if actor is None:
+                continue
+            mapper = actor.GetMapper()
+            self._lod_swapped[(owner, name)] = (actor, mapper.GetInputDataObject(0, 0))
+            mapper.SetInputData(proxy)
+
+    def _restore_full_resolution(self, plotter):
+        actors = getattr(plotter, 'actors', {})
+        restored = False
+        for key in [key for key in self._lod_swapped if key[0] is plotter]:
+            actor, full = self._lod_swapped.pop(key)
+            # Skip actors that were replaced mid-drag; they already show full resolution.
+            if actors.get(key[1]) is actor:
+                actor.GetMapper().SetInputData(full)
+                restored = True
+        if restored:
+            self._render_scheduler.request([plotter])
+
     def save_result(self):
         session = self.current_session()
         if "result" not in session['models']:
@@ -978,50 +1299,93 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
 
         try:
             result_mesh = session['models']["result"]
-            lut = self.create_custom_colormap()
-            save_colored_mesh(result_mesh, lut, file_path)
+            save_colored_mesh(result_mesh, distance_colormap(), file_path)
             print(f"Colored result saved to {file_path}")
         except MeshOperationError as exc:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save colored result: {exc}")
 
     def load_model(self, combo_box, name_prefix):
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+        file_paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
             self,
             "Load Model",
             "",
             "Model Files (*.stl *.ply *.vtk *.vtp)",
             options=QtWidgets.QFileDialog.DontUseNativeDialog,
         )
-        if not file_path:
-            return
-        try:
-            mesh = load_mesh(file_path)
-        except MeshOperationError as exc:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load model: {exc}")
+        if not file_paths:
             return
+        session = self.current_session()
+        # Files load in parallel but are applied in the order they were
+        # selected, so the last one selected ends up displayed.
+        batch = {'order': [], 'results': {}}
+        for file_path in file_paths:
+            request = self._loader.load(
+                file_path, {'kind': 'model', 'session': session, 'prefix': name_prefix, 'batch': batch}
+            )
+            batch['order'].append(request.request_id)
+        self._show_loading_message()
+
+    def _show_loading_message(self):
+        pending = self._loader.pending
+        if pending:
+            self.status_bar.showMessage(f"モデルを読み込み中...（残り {pending} 件）")
+        else:
+            self.status_bar.showMessage("モデルの読み込みが完了しました", 3000)
+
+    def on_mesh_loaded(self, request, mesh):
+        context = request.context
+        if context['kind'] == 'compare':
+            self._show_compare_mesh(request, mesh)
+        else:
+            self._apply_model_batch(request, mesh)
+        self._show_loading_message()
+
+    def on_mesh_load_failed(self, request, message):
+        logger.error("Failed to load %s: %s", request.path, message)
+        if request.context['kind'] == 'model':
+            self._apply_model_batch(request, None)
+        self._show_loading_message()
+        QtWidgets.QMessageBox.critical(
+            self, "Error", f"Failed to load model {os.path.basename(request.path)}: {message}"
+        )
 
+    def _apply_model_batch(self, request, mesh):
+        """Record a finished load (``mesh`` is None on failure) and apply every
+        result of its batch whose predecessors are done."""
+        context = request.context
+        batch = context['batch']
+        batch['results'][request.request_id] = (request, mesh)
+        while batch['order'] and batch['order'][0] in batch['results']:
+            done, loaded = batch['results'].pop(batch['order'].pop(0))
+            if loaded is not None:
+                self._add_loaded_model(context['session'], context['prefix'], done.path, loaded)
+
+    def _add_loaded_model(self, session, name_prefix, file_path, mesh):
+        if not self._session_alive(session):
+            logger.info("Discarding %s; its session was closed", file_path)
+            return
         file_name = os.path.basename(file_path)
         actor_name = f"{name_prefix}_{file_name}"
-
-        session = self.current_session()
         plotter = session['plotter']
 
-        if combo_box.currentData():
-            plotter.remove_actor(combo_box.currentData())
+        # 同じ役割（ターゲット/ソース）のモデルは最後に読み込んだものだけ表示
+        for name in list(session['models']):
+            if name.startswith(name_prefix + "_") and name != actor_name:
+                plotter.remove_actor(name)
+                self._forget_lod_proxies(plotter, name)
 
         session['models'][actor_name] = mesh
-        combo_box.addItem(file_name, actor_name)
-        combo_box.setCurrentIndex(combo_box.count() - 1)
         actor = plotter.add_mesh(mesh, name=actor_name, lighting=True, smooth_shading=True)
         self._apply_surface_properties(actor)
+        self._request_lod_proxy(plotter, actor_name, mesh)
         plotter.reset_camera()
+        if session is self.current_session():
+            self.rebuild_combos_for_session(session)
+            combo_box = self.target_combo if name_prefix == "target" else self.source_combo
+            combo_box.setCurrentIndex(combo_box.findData(actor_name))
         logger.info("Loaded model %s as actor %s", file_name, actor_name)
 
     def on_apply(self):
-        if self._distance_thread is not None:
-            QtWidgets.QMessageBox.information(self, "Busy", "距離計算を実行中です。完了までお待ちください。")
-            return
-
         session = self.current_session()
         target_actor_name = self.target_combo.currentData()
         source_actor_name = self.source_combo.currentData()
@@ -1035,65 +1399,165 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         target_mesh = session['models'][target_actor_name]
 
         reduction = None
+        target_points = None
         if self.decimation_group.isChecked():
-            reduction = self.decimation_slider.value() / 100.0
-
-        self.set_busy_state(True, "距離計算中...")
-        self._pending_cancel = False
-        if self._cancel_watchdog is not None:
-            self._cancel_watchdog.stop()
-            self._cancel_watchdog.deleteLater()
-            self._cancel_watchdog = None
-
-        self._distance_thread = QtCore.QThread(self)
-        self._distance_worker = DistanceComputationWorker(source_mesh, target_mesh, reduction=reduction)
-        self._distance_worker.moveToThread(self._distance_thread)
-        self._distance_thread.started.connect(self._distance_worker.run)
-        self._distance_worker.finished.connect(self.on_distance_finished)
-        self._distance_worker.error.connect(self.on_distance_error)
-        self._distance_worker.cancelled.connect(self.on_distance_cancelled)
-        self._distance_worker.finished.connect(self.cleanup_distance_worker)
-        self._distance_worker.error.connect(self.cleanup_distance_worker)
-        self._distance_worker.cancelled.connect(self.cleanup_distance_worker)
-        self._distance_thread.finished.connect(self._distance_thread.deleteLater)
-        self._distance_thread.start()
+            if self.decimation_mode_combo.currentData() == "budget":
+                target_points = self.target_points_spin.value()
+            else:
+                reduction = self.decimation_slider.value() / 100.0
+
+        roi = None
+        if self.roi_group.isChecked():
+            roi = "auto"
+            if self.roi_box_radio.isChecked():
+                if session.get('roi_bounds') is not None:
+                    roi = session['roi_bounds']
+                else:
+                    self.status_bar.showMessage("ROI ボックスが未設定のため自動 ROI を使用します", 3000)
+
+        engine = self.engine_combo.currentData() or DEFAULT_DISTANCE_ENGINE
+        job = self._jobs.submit(
+            session,
+            source_mesh,
+            target_mesh,
+            label=f"{self.source_combo.currentText()} → {self.target_combo.currentText()}",
+            priority=self.priority_combo.currentData() or 0,
+            reduction=reduction,
+            roi=roi,
+            target_points=target_points,
+            decimation_method=self.decimation_method_combo.currentData() or DEFAULT_DECIMATION_METHOD,
+            engine=engine,
+            workers=1 if self.isolated_checkbox.isChecked() else self.workers_spin.value(),
+            max_distance=COLORMAP_MAX_DISTANCE if self.bounded_checkbox.isChecked() else None,
+            progressive=self.progressive_checkbox.isChecked(),
+            isolated=self.isolated_checkbox.isChecked(),
+        )
+        if job.state == JOB_QUEUED:
+            self.status_bar.showMessage("距離計算をジョブとして登録しました", 3000)
         self._refresh_controls_enabled()
 
     def cancel_distance(self):
-        if self._distance_worker is None:
+        session = self.current_session()
+        if session is None or not self._jobs.session_jobs(session, active_only=True):
             return
-        logger.info("Cancelling distance computation on user request")
-        self._pending_cancel = True
+        logger.info("Cancelling distance jobs of the current session on user request")
         self.status_bar.showMessage("距離計算の中止を要求しました...", 3000)
-        try:
-            self._distance_worker.cancel()
-        except AttributeError:
-            logger.debug("Distance worker does not support cancel()")
-        self.cancel_button.setEnabled(False)
+        self._jobs.cancel_session(session)
         self._refresh_controls_enabled()
-        if self._cancel_watchdog is not None:
-            self._cancel_watchdog.stop()
-            self._cancel_watchdog.deleteLater()
-        self._cancel_watchdog = QtCore.QTimer(self)
-        self._cancel_watchdog.setSingleShot(True)
-        self._cancel_watchdog.timeout.connect(self._handle_cancel_timeout)
-        self._cancel_watchdog.start(2000)
-
-    def on_distance_finished(self, result_mesh, min_dist):
-        if self._pending_cancel:
-            logger.info("Distance computation finished but cancellation was requested; discarding results")
-            return
-        logger.info("Distance computation finished")
+
+    def cancel_selected_job(self):
+        rows = {index.row() for index in self.jobs_table.selectionModel().selectedRows()}
+        for job in self._jobs.jobs():
+            if self._job_row(job) in rows:
+                self._jobs.cancel(job)
+
+    def clear_finished_jobs(self):
+        self._jobs.clear_finished()
+        self._refresh_jobs_table()
+
+    def _session_alive(self, session):
+        return any(candidate is session for candidate in self.sessions)
+
+    def _session_title(self, session):
+        for index, candidate in enumerate(self.sessions):
+            if candidate is session:
+                return self.session_tabs.tabText(index)
+        return "(閉じたセッション)"
+
+    def _job_row(self, job):
+        for row in range(self.jobs_table.rowCount()):
+            item = self.jobs_table.item(row, 0)
+            if item is not None and item.data(QtCore.Qt.UserRole) == job.job_id:
+                return row
+        return None
+
+    def _job_progress_text(self, job):
+        if job.state == JOB_RUNNING:
+            if job.stage is None:
+                return "準備中..."
+            text = f"{_DISTANCE_STAGE_LABELS.get(job.stage, job.stage)} {int(round(job.fraction * 100))}%"
+            if job.eta_seconds is not None and job.fraction < 1.0:
+                text += f"（残り約 {int(math.ceil(job.eta_seconds))} 秒）"
+            return text
+        if job.state == JOB_FINISHED:
+            text = f"{job.elapsed:.1f} 秒"
+            if job.min_distance is not None:
+                text += f" / 最小 {job.min_distance:.3f} mm"
+            return text
+        if job.state == JOB_FAILED:
+            return job.message
+        return ""
+
+    def _refresh_jobs_table(self):
+        jobs = self._jobs.jobs()
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            state = _JOB_STATE_LABELS.get(job.state, job.state)
+            if job.state == JOB_RUNNING and job.cancel_requested:
+                state = "中止中"
+            values = (self._session_title(job.session), job.label, state, self._job_progress_text(job))
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if column == 0:
+                    item.setData(QtCore.Qt.UserRole, job.job_id)
+                self.jobs_table.setItem(row, column, item)
+
+    def on_job_changed(self, job):
+        self._refresh_jobs_table()
+        self._update_progress_bar()
+        self._refresh_controls_enabled()
+
+    def on_job_progress(self, job):
+        row = self._job_row(job)
+        if row is not None:
+            self.jobs_table.setItem(row, 3, QtWidgets.QTableWidgetItem(self._job_progress_text(job)))
+        self._update_progress_bar()
+
+    def _update_progress_bar(self):
+        # The status-bar bar follows the running job of the visible session.
         session = self.current_session()
-        if session is None:
+        running = [job for job in self._jobs.running_jobs() if job.session is session]
+        if not running:
+            self.distance_progress_bar.hide()
             return
-        session['models']["result"] = result_mesh
-        if min_dist is not None:
-            self.min_distance_label.setText(f"{min_dist:.4f}")
+        job = running[0]
+        if job.stage is None:
+            self.distance_progress_bar.setFormat("準備中...")
+            self.distance_progress_bar.setValue(0)
         else:
-            self.min_distance_label.setText("-")
+            label = _DISTANCE_STAGE_LABELS.get(job.stage, job.stage)
+            text = f"{label} %p%"
+            if job.eta_seconds is not None and job.fraction < 1.0:
+                text += f"（残り約 {int(math.ceil(job.eta_seconds))} 秒）"
+            self.distance_progress_bar.setFormat(text)
+            self.distance_progress_bar.setValue(int(round(job.fraction * 100)))
+        self.distance_progress_bar.show()
+
+    def on_job_finished(self, job, result_mesh):
+        if not self._session_alive(job.session):
+            logger.info("Discarding result of job %d; its session was closed", job.job_id)
+            return
+        logger.info("Distance computation finished for job %d", job.job_id)
+        self._show_distance_result(job.session, result_mesh, job.min_distance)
+        self.status_bar.showMessage(f"距離計算が完了しました（{self._session_title(job.session)}）", 3000)
+
+    def on_job_preview(self, job, result_mesh, min_dist):
+        if not self._session_alive(job.session):
+            return
+        self._show_distance_result(job.session, result_mesh, min_dist)
+        if job.session is self.current_session():
+            self.status_bar.showMessage("プレビューを表示中（詳細な計算を継続しています）...")
+
+    def _show_distance_result(self, session, result_mesh, min_dist):
+        previous = session['models'].get("result")
+        session['models']["result"] = result_mesh
+        session['min_distance'] = min_dist
+        if session is self.current_session():
+            self._update_min_distance_label(session)
 
         plotter = session['plotter']
+        if previous is not None and self._update_result_scalars(plotter, previous, result_mesh):
+            return
         plotter.remove_actor("result", render=False)
         try:
             plotter.remove_scalar_bar()
@@ -1101,47 +1565,111 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
             logger.debug("No scalar bar to remove during apply")
 
         self._add_result_mesh(plotter, result_mesh)
-        self.status_bar.showMessage("距離計算が完了しました", 3000)
 
-    def on_distance_error(self, message):
-        logger.error("Distance computation failed: %s", message)
-        QtWidgets.QMessageBox.critical(self, "Error", f"距離計算に失敗しました: {message}")
+    def _update_result_scalars(self, plotter, previous, result_mesh, name="result"):
+        """Swap new distances into the existing actor when the geometry is unchanged.
 
-    def on_distance_cancelled(self):
-        logger.info("Distance computation cancelled")
-        QtCore.QTimer.singleShot(0, lambda: self.status_bar.showMessage("距離計算を中止しました", 3000))
+        Keeps the mapper, lookup table, normals and scalar bar; returns False
+        when the actor has to be rebuilt instead.
+        """
+        actor = getattr(plotter, 'actors', {}).get(name)
+        if actor is None or (plotter, name) in self._lod_swapped:
+            return False
+        displayed = actor.GetMapper().GetInputDataObject(0, 0)
+        if displayed is None:
+            return False
+        if not replace_distance_scalars(pv.wrap(displayed), previous, result_mesh):
+            return False
+        self._request_lod_proxy(plotter, name, result_mesh)
+        plotter.render()
+        distances, _ = self._distance_scalars(result_mesh)
+        logger.info("Updated %s distances in place (%d values)", name, len(distances))
+        return True
 
-    def cleanup_distance_worker(self, *args):
-        thread = self._distance_thread
-        if thread is not None:
-            try:
-                thread.requestInterruption()
-                thread.quit()
-                thread.wait(200)
-            except RuntimeError:
-                pass
-        if self._distance_worker is not None:
+    def _update_min_distance_label(self, session):
+        min_dist = session.get('min_distance') if session is not None else None
+        if min_dist is not None:
+            self.min_distance_label.setText(f"{min_dist:.4f}")
+        else:
+            self.min_distance_label.setText("-")
+
+    def on_job_failed(self, job, message):
+        logger.error("Distance computation failed for job %d: %s", job.job_id, message)
+        QtWidgets.QMessageBox.critical(
+            self, "Error", f"距離計算に失敗しました（{self._session_title(job.session)}）: {message}"
+        )
+
+    def on_job_cancelled(self, job):
+        logger.info("Distance computation cancelled for job %d", job.job_id)
+        message = "距離計算を中止しました"
+        if job.preview_shown:
+            message = "距離計算を中止しました（最後のプレビュー結果を表示しています）"
+        QtCore.QTimer.singleShot(0, lambda: self.status_bar.showMessage(message, 3000))
+
+    def closeEvent(self, event):
+        self._jobs.shutdown()
+        self._loader.wait()
+        self._lod_builder.wait()
+        super().closeEvent(event)
+
+    # --- ROI ボックス ---
+    def _default_roi_bounds(self, session):
+        models = session['models']
+        target = models.get(self.target_combo.currentData())
+        source = models.get(self.source_combo.currentData())
+        if target is not None and source is not None:
+            bounds = overlap_bounds(source, target, COLORMAP_MAX_DISTANCE)
+            if bounds is not None:
+                return bounds
+        meshes = [mesh for name, mesh in models.items() if name != "result"]
+        if not meshes:
+            return None
+        stacked = np.array([mesh.bounds for mesh in meshes], dtype=float)
+        lower = stacked[:, 0::2].min(axis=0)
+        upper = stacked[:, 1::2].max(axis=0)
+        return tuple(float(v) for pair in zip(lower, upper) for v in pair)
+
+    def toggle_roi_box(self, checked):
+        plotter = getattr(self, '_roi_box_plotter', None)
+        if plotter is not None:
             try:
-                self._distance_worker.deleteLater()
+                plotter.clear_box_widgets()
             except Exception:
-                pass
-        self._distance_thread = None
-        self._distance_worker = None
-        self.set_busy_state(False)
-        self._pending_cancel = False
-        if self._cancel_watchdog is not None:
-            self._cancel_watchdog.stop()
-            self._cancel_watchdog.deleteLater()
-            self._cancel_watchdog = None
-        self._refresh_controls_enabled()
+                logger.debug("Failed to clear ROI box widget", exc_info=True)
+            event_filter = getattr(plotter, "_viewport_event_filter", None)
+            if event_filter is not None:
+                event_filter.set_passthrough(False)
+            self._roi_box_plotter = None
+        if not checked:
+            return
 
-    def _handle_cancel_timeout(self):
-        logger.warning("Cancel watchdog triggered; forcing cleanup")
-        QtCore.QTimer.singleShot(0, lambda: self.status_bar.showMessage("距離計算を中止しました", 3000))
-        self.cleanup_distance_worker()
+        session = self.current_session()
+        if session is None or not hasattr(session['plotter'], 'add_box_widget'):
+            self.roi_edit_button.setChecked(False)
+            return
+        bounds = session.get('roi_bounds') or self._default_roi_bounds(session)
+        if bounds is None:
+            QtWidgets.QMessageBox.warning(self, "Warning", "ROI を設定するにはモデルを読み込んでください。")
+            self.roi_edit_button.setChecked(False)
+            return
+        plotter = session['plotter']
+        session['roi_bounds'] = tuple(bounds)
+        plotter.add_box_widget(
+            partial(self._on_roi_box_changed, session),
+            bounds=bounds,
+            factor=1.0,
+            rotation_enabled=False,
+        )
+        event_filter = getattr(plotter, "_viewport_event_filter", None)
+        if event_filter is not None:
+            event_filter.set_passthrough(True)
+        self._roi_box_plotter = plotter
+        self.roi_box_radio.setChecked(True)
+        self.roi_group.setChecked(True)
 
-    def create_custom_colormap(self):
-        return build_colormap()
+    def _on_roi_box_changed(self, session, box):
+        session['roi_bounds'] = tuple(float(v) for v in box.bounds)
+        logger.info("ROI box updated: %s", tuple(round(v, 2) for v in session['roi_bounds']))
 
     def set_actor_visibility(self, name, visible):
         session = self.current_session()
@@ -1170,12 +1698,15 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
 
         # 既存セッションからスナップショット
         if copy_from is not None:
+            session['roi_bounds'] = copy_from.get('roi_bounds')
             for name, mesh in copy_from['models'].items():
                 try:
-                    mcopy = mesh.copy()
+                    # Snapshots share the buffers of the original session.
+                    mcopy = shared_copy(mesh)
                     session['models'][name] = mcopy
                     actor = plotter.add_mesh(mcopy, name=name, lighting=True, smooth_shading=True)
                     self._apply_surface_properties(actor)
+                    self._request_lod_proxy(plotter, name, mcopy)
                 except Exception:
                     pass
             plotter.reset_camera()
@@ -1199,22 +1730,47 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         return self.sessions[idx]
 
     def on_tab_changed(self, index):
+        if self.roi_edit_button.isChecked():
+            self.roi_edit_button.setChecked(False)
         if index < 0 or index >= len(self.sessions):
             return
         session = self.sessions[index]
+        self._apply_session_visibility()
         self.rebuild_combos_for_session(session)
+        self._update_min_distance_label(session)
+        self._update_progress_bar()
+        self._refresh_controls_enabled()
         # 比較タブのセッション選択も更新
         self.rebuild_compare_session_combos()
 
+    # --- 非表示セッションの描画停止 ---
+    def _apply_session_visibility(self):
+        active = self.current_session()
+        for session in self.sessions:
+            if session is active:
+                resume_session(session)
+            else:
+                self._suspend_session(session)
+
+    def _suspend_session(self, session):
+        release = self.release_hidden_checkbox.isChecked()
+        if suspend_session(session, release=release):
+            logger.info("Released graphics resources of %s", self._session_title(session))
+
     def close_session(self, index):
         if len(self.sessions) <= 1:
             # 少なくとも1タブは残す
             return
+        self._jobs.cancel_session(self.sessions[index])
         plotter = self.sessions[index]['plotter']
         self.session_tabs.removeTab(index)
         del self.sessions[index]
         self._plotter_brightness.pop(plotter, None)
         self._plotter_is_compare.pop(plotter, None)
+        self._render_scheduler.forget(plotter)
+        self._forget_lod_proxies(plotter)
+        # removeTab already emitted currentChanged against the old session list.
+        self._apply_session_visibility()
         # タブ変更イベントでコンボ再構築される
         self.rebuild_compare_session_combos()
 
@@ -1252,33 +1808,40 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         )
         if not file_path:
             return
+        self._compare_requests[side] = self._loader.load(file_path, {'kind': 'compare', 'side': side})
+        self._show_loading_message()
+
+    def _show_compare_mesh(self, request, mesh):
+        side = request.context['side']
+        if self._compare_requests.get(side) is not request:
+            logger.info("Discarding superseded comparison load of %s", request.path)
+            return
+        del self._compare_requests[side]
         plotter = self.compare_plotter_left if side == 'left' else self.compare_plotter_right
+        # 既存表示をクリアして単一モデルを表示
         try:
-            # 既存表示をクリアして単一モデルを表示
-            try:
-                plotter.clear()
-            except Exception:
-                for name in list(plotter.actors.keys()):
-                    plotter.remove_actor(name)
-            self._reapply_plotter_lighting(plotter)
-            plotter.add_axes()
-            label = 'Left' if side == 'left' else 'Right'
-            plotter.add_text(label, position='upper_left', font_size=12)
-
-            mesh = load_mesh(file_path)
-            name = os.path.basename(file_path)
-            distances, _ = self._distance_scalars(mesh)
-            if distances is not None:
-                self._add_result_mesh(plotter, mesh, name=name)
-            else:
-                actor = plotter.add_mesh(mesh, name=name, lighting=True, smooth_shading=True)
-                self._apply_surface_properties(actor)
-            plotter.reset_camera()
-            logger.info("Loaded comparison model %s onto %s panel", name, side)
-            # カメラ連動を再適用
-            self._link_compare_views()
-        except MeshOperationError as exc:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load model: {exc}")
+            plotter.clear()
+        except Exception:
+            for name in list(plotter.actors.keys()):
+                plotter.remove_actor(name)
+        self._forget_lod_proxies(plotter)
+        self._reapply_plotter_lighting(plotter)
+        plotter.add_axes()
+        label = 'Left' if side == 'left' else 'Right'
+        plotter.add_text(label, position='upper_left', font_size=12)
+
+        name = os.path.basename(request.path)
+        distances, _ = self._distance_scalars(mesh)
+        if distances is not None:
+            self._add_result_mesh(plotter, mesh, name=name)
+        else:
+            actor = plotter.add_mesh(mesh, name=name, lighting=True, smooth_shading=True)
+            self._apply_surface_properties(actor)
+            self._request_lod_proxy(plotter, name, mesh)
+        plotter.reset_camera()
+        logger.info("Loaded comparison model %s onto %s panel", name, side)
+        # カメラ連動を再適用
+        self._link_compare_views()
 
     def save_compare_screenshot(self):
         file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
@@ -1316,6 +1879,8 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
             combined_array = np.asarray(combined_img)
             if np.issubdtype(combined_array.dtype, np.floating):
                 combined_array = np.clip(combined_array, 0.0, 255.0).astype(np.uint8)
+            from matplotlib.image import imsave
+
             imsave(file_path, combined_array)
             print(f"Compare screenshot saved to {file_path}")
             logger.info("Compare screenshot saved to %s", file_path)
@@ -1331,6 +1896,7 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         except Exception:
             for name in list(plotter.actors.keys()):
                 plotter.remove_actor(name)
+        self._forget_lod_proxies(plotter)
         self._reapply_plotter_lighting(plotter)
         plotter.add_axes()
         label = 'Left' if side == 'left' else 'Right'
@@ -1343,9 +1909,18 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         except Exception:
             return False
 
+    def _update_decimation_mode(self):
+        budget = self.decimation_mode_combo.currentData() == "budget"
+        self.decimation_slider.setEnabled(not budget)
+        self.target_points_spin.setEnabled(budget)
+
+    def _update_workers_enabled(self):
+        # The isolated child always queries serially, so Workers does not apply.
+        if self.isolated_checkbox.isChecked():
+            self.workers_spin.setEnabled(False)
+
     def _refresh_controls_enabled(self):
         allowed = self._interaction_allowed()
-        busy = self._is_busy
         try:
             self.create_root.setEnabled(allowed)
             self.compare_root.setEnabled(allowed)
@@ -1359,7 +1934,15 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
             getattr(self, 'target_combo', None),
             getattr(self, 'source_combo', None),
             getattr(self, 'decimation_group', None),
-            getattr(self, 'decimation_slider', None),
+            getattr(self, 'decimation_mode_combo', None),
+            getattr(self, 'decimation_method_combo', None),
+            getattr(self, 'engine_combo', None),
+            getattr(self, 'workers_spin', None),
+            getattr(self, 'bounded_checkbox', None),
+            getattr(self, 'progressive_checkbox', None),
+            getattr(self, 'isolated_checkbox', None),
+            getattr(self, 'priority_combo', None),
+            getattr(self, 'roi_group', None),
             getattr(self, 'result_visibility_checkbox', None),
             getattr(self, 'result_opacity_slider', None),
             getattr(self, 'target_visibility_checkbox', None),
@@ -1385,11 +1968,20 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         for widget in general_controls:
             if widget is not None:
                 try:
-                    widget.setEnabled(allowed and not busy)
+                    widget.setEnabled(allowed)
                 except Exception:
                     continue
 
-        for widget in (getattr(self, 'debug_refresh_button', None), getattr(self, 'debug_clear_button', None)):
+        if getattr(self, 'decimation_mode_combo', None) is not None:
+            self._update_decimation_mode()
+        if getattr(self, 'isolated_checkbox', None) is not None:
+            self._update_workers_enabled()
+
+        for widget in (
+            getattr(self, 'debug_refresh_button', None),
+            getattr(self, 'debug_clear_button', None),
+            getattr(self, 'clear_result_cache_button', None),
+        ):
             if widget is not None:
                 try:
                     widget.setEnabled(allowed)
@@ -1398,7 +1990,9 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
 
         if getattr(self, 'cancel_button', None) is not None:
             try:
-                self.cancel_button.setEnabled(allowed and self._distance_worker is not None and busy)
+                session = self.current_session()
+                active = session is not None and bool(self._jobs.session_jobs(session, active_only=True))
+                self.cancel_button.setEnabled(allowed and active)
             except Exception:
                 pass
 
@@ -1437,6 +2031,9 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         return default_path
 
     def _refresh_debug_console(self):
+        self._refresh_cache_stats()
+        self._refresh_session_memory()
+        self._refresh_render_stats()
         path = self._log_path
         if not path or not os.path.exists(path):
             self.debug_console.setPlainText("ログファイルが見つかりませんでした。")
@@ -1453,6 +2050,62 @@ class JointSpaceVisualizerApp(QtWidgets.QMainWindow):
         self.debug_console.verticalScrollBar().setValue(self.debug_console.verticalScrollBar().maximum())
         self.debug_status_label.setText(f"ログパス: {path}")
 
+    def _refresh_cache_stats(self):
+        lines = []
+        for stats in cache_stats():
+            lines.append(
+                "キャッシュ {name}: {entries} 件 / {size:.1f} MB（ヒット {hits}・ミス {misses}・破棄 {evictions}）".format(
+                    size=stats["bytes"] / (1024 * 1024), **stats
+                )
+            )
+        self.cache_stats_label.setText("\n".join(lines))
+
+    def _refresh_session_memory(self):
+        per_session = []
+        owners = {}
+        for session in self.sessions:
+            buffers = {}
+            for mesh in session['models'].values():
+                try:
+                    buffers.update(mesh_buffers(mesh))
+                except Exception:
+                    logger.debug("Could not inspect mesh buffers", exc_info=True)
+            per_session.append((session, buffers))
+            for address in buffers:
+                owners[address] = owners.get(address, 0) + 1
+        lines = []
+        total = {}
+        for session, buffers in per_session:
+            size = sum(buffers.values())
+            shared = sum(nbytes for address, nbytes in buffers.items() if owners[address] > 1)
+            total.update(buffers)
+            lines.append(
+                "メモリ {title}: {size:.1f} MB（他セッションと共有 {shared:.1f} MB）{state}".format(
+                    title=self._session_title(session),
+                    state="・描画停止中" if session.get('suspended') else "",
+                    size=size / (1024 * 1024),
+                    shared=shared / (1024 * 1024),
+                )
+            )
+        lines.append(
+            "メモリ 全セッション合計（共有分は 1 回）: {size:.1f} MB".format(
+                size=sum(total.values()) / (1024 * 1024)
+            )
+        )
+        self.session_memory_label.setText("\n".join(lines))
+
+    def _refresh_render_stats(self):
+        stats = self._render_scheduler.stats()
+        self.render_stats_label.setText(
+            "描画 ({fps:.0f} fps 上限): 要求 {requests} 回 / フレーム {frames} 回 / 描画 {renders} 回"
+            "（まとめた要求 {coalesced}・落ちたフレーム {dropped}）".format(**stats)
+        )
+
+    def _clear_result_cache(self):
+        clear_result_cache()
+        self._refresh_cache_stats()
+        self.debug_status_label.setText("距離結果キャッシュを削除しました。")
+
     def _clear_debug_console(self):
         self.debug_console.clear()
         self.debug_status_label.setText("コンソールをクリアしました。ログ自体は削除されていません。")
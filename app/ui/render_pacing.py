@@ -0,0 +1,74 @@
+"""Frame bookkeeping for interactive redraws, kept free of Qt so it can be tested headless."""
+
+import time
+
+
+class FrameCoalescer:
+    """Collects redraw requests into frames at most ``frame_interval`` seconds apart.
+
+    Callers mark plotters dirty with :meth:`request`, optionally passing a
+    ``prepare`` callback (e.g. applying accumulated camera motion) that runs
+    once before the frame is drawn.  Requests for a plotter that is already
+    waiting for the next frame are counted as coalesced; frame slots missed
+    because the frame started late are counted as dropped.  The caller owns
+    the timer: it waits as long as :meth:`request` says, then draws what
+    :meth:`take_frame` returns.
+    """
+
+    def __init__(self, frame_interval):
+        self.frame_interval = frame_interval
+        # dicts used as ordered sets
+        self._prepare = {}
+        self._dirty = {}
+        self._last_frame = None
+        self._due = None
+        self.requests = 0
+        self.frames = 0
+        self.renders = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def request(self, plotters, prepare=None, now=None):
+        """Mark ``plotters`` dirty; returns the wait in seconds until the next
+        frame, or ``None`` when a frame is already scheduled."""
+        self.requests += 1
+        if prepare is not None:
+            self._prepare[prepare] = None
+        for plotter in plotters:
+            if plotter in self._dirty:
+                self.coalesced += 1
+            else:
+                self._dirty[plotter] = None
+        if self._due is not None:
+            return None
+        now = time.perf_counter() if now is None else now
+        wait = 0.0
+        if self._last_frame is not None:
+            wait = max(0.0, self._last_frame + self.frame_interval - now)
+        self._due = now + wait
+        return wait
+
+    def take_frame(self, now=None):
+        """Start the scheduled frame; returns its ``(prepare callbacks, plotters)``."""
+        now = time.perf_counter() if now is None else now
+        if self._due is not None and now - self._due > self.frame_interval:
+            self.dropped += int((now - self._due) // self.frame_interval)
+        self._due = None
+        self._last_frame = now
+        self.frames += 1
+        prepare, self._prepare = list(self._prepare), {}
+        plotters, self._dirty = list(self._dirty), {}
+        return prepare, plotters
+
+    def forget(self, plotter):
+        self._dirty.pop(plotter, None)
+
+    def stats(self):
+        return {
+            "fps": 1.0 / self.frame_interval,
+            "requests": self.requests,
+            "frames": self.frames,
+            "renders": self.renders,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,45 @@
+"""Rendering state of hidden session tabs, kept free of Qt so it can be tested headless."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def suspend_session(session, release=False):
+    """Stop rendering ``session['plotter']`` while its tab is hidden.
+
+    With ``release`` the plotter's GPU buffers, textures and shaders are freed
+    as well; returns True when that happened in this call.
+    """
+    plotter = session['plotter']
+    if not session.get('suspended'):
+        session['suspended'] = True
+        # Render calls (finished jobs, lighting changes) become no-ops until shown.
+        plotter.suppress_rendering = True
+    if not release or session.get('released'):
+        return False
+    render_window = getattr(plotter, 'render_window', None)
+    if render_window is None:
+        return False
+    try:
+        # Frees uploaded buffers, textures and shaders; the next render rebuilds them.
+        render_window.ReleaseGraphicsResources(render_window)
+    except Exception:
+        logger.debug("Failed to release graphics resources", exc_info=True)
+        return False
+    session['released'] = True
+    return True
+
+
+def resume_session(session):
+    """Re-enable rendering of a suspended session and draw it once."""
+    if not session.get('suspended'):
+        return
+    session['suspended'] = False
+    session['released'] = False
+    plotter = session['plotter']
+    plotter.suppress_rendering = False
+    try:
+        plotter.render()
+    except Exception:
+        logger.debug("Failed to render resumed session", exc_info=True)
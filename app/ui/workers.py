@@ -1,72 +1,159 @@
 """Qt worker objects for background operations."""
 
+import logging
 import threading
+import time
+from functools import partial
 
 from PyQt5 import QtCore
 
 from app.services import (
     MeshOperationError,
     compute_distance,
+    compute_distance_in_roi,
+    compute_distance_isolated,
     DistanceComputationCancelled,
+    build_lod_proxy,
+    load_mesh,
+    shared_copy,
 )
 
+logger = logging.getLogger(__name__)
+
+# Vertex budgets of the coarse passes run ahead of the requested computation.
+PROGRESSIVE_PREVIEW_POINTS = (20000, 100000)
+# Minimum spacing between progress signals so the GUI event loop is not flooded.
+PROGRESS_INTERVAL = 0.1
+
 
 class DistanceComputationWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal(object, object)
     error = QtCore.pyqtSignal(str)
     cancelled = QtCore.pyqtSignal()
+    preview = QtCore.pyqtSignal(object, object)
+    # stage, fraction of that stage, estimated seconds left in it (None if unknown)
+    progress = QtCore.pyqtSignal(str, float, object)
 
-    def __init__(self, source_mesh, target_mesh, reduction=None):
+    def __init__(
+        self,
+        source_mesh,
+        target_mesh,
+        reduction=None,
+        roi=None,
+        progressive=False,
+        isolated=False,
+        **distance_options,
+    ):
         super().__init__()
-        self._source = source_mesh.copy()
-        self._target = target_mesh.copy()
+        # Own attribute containers over the GUI's buffers; nothing writes them in place.
+        self._source = shared_copy(source_mesh)
+        self._target = shared_copy(target_mesh)
         self._reduction = reduction
+        # None: whole meshes, "auto": bounding-box overlap, tuple: explicit bounds
+        self._roi = roi
+        self._distance_options = distance_options
+        # Emit clustered low-resolution results first, then the requested one.
+        self._progressive = progressive
+        # Run each pass in a child process that cancel terminates outright.
+        self._isolated = isolated
         self._cancel_requested = False
         self._cancel_lock = threading.Lock()
-        self._current_filter = None
+        self._progress_lock = threading.Lock()
+        self._stage_started = {}
+        self._last_stage = None
+        self._last_progress = 0.0
 
     @QtCore.pyqtSlot()
     def run(self):
         try:
-            result_mesh, min_dist = compute_distance(
-                self._source,
-                self._target,
-                reduction=self._reduction,
-                abort_event=self._should_cancel,
-                filter_callback=self._register_filter,
-            )
+            if self._progressive:
+                for budget in self._preview_budgets():
+                    started = time.perf_counter()
+                    # Previews stay out of the decimation and result caches,
+                    # where they would evict entries the final pass reuses.
+                    preview = self._compute(
+                        reduction=None,
+                        target_points=budget,
+                        decimation_method="clustering",
+                        cache=False,
+                    )
+                    logger.info(
+                        "Progressive preview at %d vertices ready in %.2fs",
+                        budget,
+                        time.perf_counter() - started,
+                    )
+                    self.preview.emit(*preview)
+            result_mesh, min_dist = self._compute()
         except DistanceComputationCancelled:
+            # The last preview, if any, stays on screen as the best result.
             self.cancelled.emit()
             return
         except MeshOperationError as exc:  # pragma: no cover - signalized upwards
             self.error.emit(str(exc))
             return
-        finally:
-            self._register_filter(None)
+        except Exception as exc:  # pragma: no cover - the scheduler still needs an outcome
+            logger.error("Unexpected failure computing distances", exc_info=True)
+            self.error.emit(f"{type(exc).__name__}: {exc}")
+            return
 
         self.finished.emit(result_mesh, min_dist)
 
+    def _compute(self, **overrides):
+        options = dict(
+            reduction=self._reduction,
+            abort_event=self._should_cancel,
+            progress=self._report_progress,
+            **self._distance_options,
+        )
+        options.update(overrides)
+        with self._progress_lock:
+            self._stage_started.clear()
+            self._last_stage = None
+        bounds = None if self._roi in (None, "auto") else self._roi
+        if self._isolated:
+            return compute_distance_isolated(
+                self._source, self._target, roi=self._roi is not None, bounds=bounds, **options
+            )
+        if self._roi is None:
+            return compute_distance(self._source, self._target, **options)
+        return compute_distance_in_roi(self._source, self._target, bounds=bounds, **options)
+
+    def _preview_budgets(self):
+        final_points = self._source.n_points
+        if self._distance_options.get("target_points") is not None:
+            final_points = min(final_points, self._distance_options["target_points"])
+        elif self._reduction is not None:
+            final_points = int(final_points * (1.0 - self._reduction))
+        # A preview only pays off when it is much cheaper than the final pass.
+        return [budget for budget in PROGRESSIVE_PREVIEW_POINTS if budget * 2 <= final_points]
+
+    def _report_progress(self, stage, fraction):
+        # Called from the worker thread and the decimation threads.
+        now = time.perf_counter()
+        with self._progress_lock:
+            started = self._stage_started.setdefault(stage, now)
+            if (
+                stage == self._last_stage
+                and fraction < 1.0
+                and now - self._last_progress < PROGRESS_INTERVAL
+            ):
+                return
+            self._last_stage = stage
+            self._last_progress = now
+        eta = None
+        if fraction >= 1.0:
+            eta = 0.0
+        elif fraction > 0.0:
+            eta = (now - started) * (1.0 - fraction) / fraction
+        self.progress.emit(stage, fraction, eta)
+
     def cancel(self):
+        # Distance evaluation runs in chunks and polls _should_cancel between them.
         with self._cancel_lock:
             self._cancel_requested = True
-            filt = self._current_filter
         thread = self.thread()
         if thread is not None:
             thread.requestInterruption()
-        if filt is not None:
-            try:
-                filt.AbortExecuteOn()
-            except AttributeError:
-                try:
-                    filt.SetAbortExecute(True)
-                except AttributeError:
-                    pass
-            try:
-                execu = filt.GetExecutive()
-                if execu is not None:
-                    execu.SetAbortExecute(1)
-            except AttributeError:
-                pass
 
     def _should_cancel(self):
         interrupted = False
@@ -76,6 +163,354 @@ class DistanceComputationWorker(QtCore.QObject):
         with self._cancel_lock:
             return self._cancel_requested or interrupted
 
-    def _register_filter(self, filt):
-        with self._cancel_lock:
-            self._current_filter = filt
+
+# Files read at the same time; parsing is mostly I/O and GIL-free VTK/NumPy work.
+MAX_LOAD_THREADS = 4
+
+
+class MeshLoadRequest:
+    """A file being read by :class:`MeshLoader`; ``context`` is opaque caller data."""
+
+    def __init__(self, request_id, path, context):
+        self.request_id = request_id
+        self.path = path
+        self.context = context
+
+
+class _MeshLoadTask(QtCore.QRunnable):
+    def __init__(self, loader, request):
+        super().__init__()
+        self._loader = loader
+        self._request = request
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            mesh = load_mesh(self._request.path)
+            prepare_mesh_for_display(mesh)
+        except MeshOperationError as exc:
+            self._loader.failed.emit(self._request, str(exc))
+            return
+        except Exception as exc:  # pragma: no cover - VTK provides detail
+            logger.exception("Unexpected failure loading %s", self._request.path)
+            self._loader.failed.emit(self._request, str(exc))
+            return
+        logger.info(
+            "Prepared %s for display in %.2fs", self._request.path, time.perf_counter() - started
+        )
+        self._loader.loaded.emit(self._request, mesh)
+
+
+def prepare_mesh_for_display(mesh):
+    """Attach smooth-shading normals and cache bounds so rendering starts immediately.
+
+    ``add_mesh(..., smooth_shading=True)`` skips its own normal computation
+    when a ``Normals`` point array is present.  Meshes without polygons
+    (point clouds, line sets) are drawn without normals.
+    """
+    if mesh.n_points and mesh.GetNumberOfPolys() and "Normals" not in mesh.point_data:
+        try:
+            shaded = mesh.compute_normals(cell_normals=False, split_vertices=False)
+        except Exception:  # pragma: no cover - e.g. mixed strips and lines
+            logger.warning("Could not compute normals; drawing without them", exc_info=True)
+        else:
+            mesh.point_data["Normals"] = shaded.point_data["Normals"]
+    # Bounds are computed once and cached on the dataset.
+    mesh.GetBounds()
+    return mesh
+
+
+class MeshLoader(QtCore.QObject):
+    """Reads meshes on a thread pool and hands them back to the GUI thread."""
+
+    loaded = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, str)
+
+    def __init__(self, max_threads=MAX_LOAD_THREADS, parent=None):
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._next_id = 1
+        self._pending = 0
+        self.loaded.connect(self._on_done)
+        self.failed.connect(self._on_done)
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def load(self, path, context=None):
+        request = MeshLoadRequest(self._next_id, path, context)
+        self._next_id += 1
+        self._pending += 1
+        self._pool.start(_MeshLoadTask(self, request))
+        return request
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_done(self, *args):
+        self._pending -= 1
+
+
+class _LodProxyTask(QtCore.QRunnable):
+    def __init__(self, builder, key, mesh):
+        super().__init__()
+        self._builder = builder
+        self._key = key
+        # The live mesh only identifies the request; the build reads a copy
+        # whose attribute containers the GUI thread never touches.
+        self._mesh = mesh
+        self._input = shared_copy(mesh)
+
+    def run(self):
+        try:
+            proxy = build_lod_proxy(self._input)
+            if proxy is not None:
+                prepare_mesh_for_display(proxy)
+                # The mapper's input is swapped directly, so the normals must be active.
+                proxy.GetPointData().SetActiveNormals("Normals")
+        except Exception:  # pragma: no cover - the full mesh is still drawn
+            logger.warning("Could not build LOD proxy", exc_info=True)
+            proxy = None
+        self._builder.built.emit(self._key, self._mesh, proxy)
+
+
+class LodProxyBuilder(QtCore.QObject):
+    """Builds level-of-detail proxies on a background thread.
+
+    ``built`` carries the caller's key, the full mesh and the proxy (``None``
+    when the mesh is small enough to draw as is or the build failed).
+    """
+
+    built = QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    def build(self, key, mesh):
+        self._pool.start(_LodProxyTask(self, key, mesh))
+
+    def wait(self):
+        self._pool.waitForDone()
+
+
+# Job states, in lifecycle order.
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+
+
+class DistanceJob:
+    """One queued distance computation and the session its result belongs to."""
+
+    def __init__(self, job_id, session, label, priority, source_mesh, target_mesh, worker_options):
+        self.job_id = job_id
+        # Opaque owner; results are routed back to it, never to the current tab.
+        self.session = session
+        self.label = label
+        # Higher runs first; ties keep submission order.
+        self.priority = priority
+        self.state = JOB_QUEUED
+        self.message = ""
+        self.min_distance = None
+        self.fraction = 0.0
+        self.stage = None
+        self.eta_seconds = None
+        self.preview_shown = False
+        self.cancel_requested = False
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self._source = source_mesh
+        self._target = target_mesh
+        self._worker_options = worker_options
+        self._worker = None
+        self._thread = None
+
+    @property
+    def active(self):
+        return self.state in (JOB_QUEUED, JOB_RUNNING)
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+
+class DistanceJobScheduler(QtCore.QObject):
+    """Runs distance jobs on a bounded pool of worker threads.
+
+    Each session has its own queue and at most one running job, so results
+    for a session arrive in submission order; different sessions run side by
+    side up to ``max_concurrent``.  The next job to start is the
+    highest-priority head among idle sessions.
+    """
+
+    job_added = QtCore.pyqtSignal(object)
+    job_changed = QtCore.pyqtSignal(object)
+    job_preview = QtCore.pyqtSignal(object, object, object)
+    job_progress = QtCore.pyqtSignal(object)
+    job_finished = QtCore.pyqtSignal(object, object)
+    job_failed = QtCore.pyqtSignal(object, str)
+    job_cancelled = QtCore.pyqtSignal(object)
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT_JOBS, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._jobs = []
+        self._queues = {}
+        self._next_id = 1
+
+    def jobs(self):
+        return list(self._jobs)
+
+    def session_jobs(self, session, active_only=False):
+        return [
+            job
+            for job in self._jobs
+            if job.session is session and (job.active or not active_only)
+        ]
+
+    def running_jobs(self):
+        return [job for job in self._jobs if job.state == JOB_RUNNING]
+
+    def set_max_concurrent(self, max_concurrent):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._dispatch()
+
+    def submit(self, session, source_mesh, target_mesh, label="", priority=0, **worker_options):
+        """Queue a job; ``worker_options`` go to :class:`DistanceComputationWorker`."""
+        job = DistanceJob(
+            self._next_id, session, label, priority, source_mesh, target_mesh, worker_options
+        )
+        self._next_id += 1
+        self._jobs.append(job)
+        queue = self._queues.setdefault(id(session), [])
+        queue.append(job)
+        # Stable sort keeps submission order within a priority.
+        queue.sort(key=lambda queued: -queued.priority)
+        logger.info("Queued distance job %d (%s, priority %d)", job.job_id, label, priority)
+        self.job_added.emit(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job):
+        if job.state == JOB_QUEUED:
+            self._queues.get(id(job.session), []).remove(job)
+            self._finish(job, JOB_CANCELLED)
+            self.job_cancelled.emit(job)
+        elif job.state == JOB_RUNNING and not job.cancel_requested:
+            logger.info("Cancelling distance job %d", job.job_id)
+            job.cancel_requested = True
+            job._worker.cancel()
+            self.job_changed.emit(job)
+
+    def cancel_session(self, session):
+        for job in self.session_jobs(session, active_only=True):
+            self.cancel(job)
+
+    def clear_finished(self):
+        self._jobs = [job for job in self._jobs if job.active]
+
+    def shutdown(self):
+        """Cancel everything and wait for running threads to exit."""
+        for job in list(self._jobs):
+            self.cancel(job)
+        for job in self.running_jobs():
+            job._thread.quit()
+            job._thread.wait()
+
+    def _dispatch(self):
+        while len(self.running_jobs()) < self.max_concurrent:
+            busy = {id(job.session) for job in self.running_jobs()}
+            heads = [
+                queue[0]
+                for key, queue in self._queues.items()
+                if queue and key not in busy
+            ]
+            if not heads:
+                return
+            job = min(heads, key=lambda head: (-head.priority, head.job_id))
+            self._queues[id(job.session)].pop(0)
+            self._start(job)
+
+    def _start(self, job):
+        job.state = JOB_RUNNING
+        job.started_at = time.perf_counter()
+        thread = QtCore.QThread(self)
+        worker = DistanceComputationWorker(job._source, job._target, **job._worker_options)
+        # The worker holds its own copies; the job no longer needs the inputs.
+        job._source = job._target = None
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.preview.connect(partial(self._on_preview, job))
+        worker.progress.connect(partial(self._on_progress, job))
+        worker.finished.connect(partial(self._on_finished, job))
+        worker.error.connect(partial(self._on_error, job))
+        worker.cancelled.connect(partial(self._on_cancelled, job))
+        thread.finished.connect(thread.deleteLater)
+        job._worker = worker
+        job._thread = thread
+        logger.info("Started distance job %d (%s)", job.job_id, job.label)
+        thread.start()
+        self.job_changed.emit(job)
+
+    def _on_preview(self, job, result_mesh, min_dist):
+        if job.cancel_requested:
+            return
+        job.preview_shown = True
+        job.min_distance = min_dist
+        self.job_preview.emit(job, result_mesh, min_dist)
+
+    def _on_progress(self, job, stage, fraction, eta_seconds):
+        job.stage = stage
+        job.fraction = fraction
+        job.eta_seconds = eta_seconds
+        self.job_progress.emit(job)
+
+    def _on_finished(self, job, result_mesh, min_dist):
+        if job.cancel_requested:
+            logger.info("Distance job %d finished after cancel; discarding results", job.job_id)
+            self._release(job, JOB_CANCELLED)
+            self.job_cancelled.emit(job)
+            return
+        job.min_distance = min_dist
+        self._release(job, JOB_FINISHED)
+        self.job_finished.emit(job, result_mesh)
+
+    def _on_error(self, job, message):
+        job.message = message
+        self._release(job, JOB_FAILED)
+        self.job_failed.emit(job, message)
+
+    def _on_cancelled(self, job):
+        self._release(job, JOB_CANCELLED)
+        self.job_cancelled.emit(job)
+
+    def _release(self, job, state):
+        thread = job._thread
+        try:
+            thread.quit()
+            # The worker has already emitted its final signal.
+            thread.wait()
+        except RuntimeError:
+            pass
+        job._worker.deleteLater()
+        job._worker = None
+        job._thread = None
+        self._finish(job, state)
+        self._dispatch()
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished_at = time.perf_counter()
+        logger.info("Distance job %d %s", job.job_id, state)
+        self.job_changed.emit(job)
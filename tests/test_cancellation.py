@@ -0,0 +1,103 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services.mesh_ops import (  # noqa: E402
+    DistanceComputationCancelled,
+    _ImplicitDistance,
+    compute_distance,
+)
+
+# Cancel must take effect within this long, whatever stage is running.
+CANCEL_BOUND_SECONDS = 0.1
+# How long a stage runs before the test cancels it.
+CANCEL_AFTER_SECONDS = 0.3
+
+
+def make_queries(count):
+    return np.random.default_rng(0).uniform(-2.0, 2.0, size=(count, 3))
+
+
+def large_pair(seed):
+    # About 655k source and 164k target vertices of even density; seeds keep
+    # the meshes out of each other's caches.
+    source = pv.Icosphere(nsub=8)
+    target = pv.Icosphere(radius=0.6, nsub=7)
+    target.points += np.random.default_rng(seed).uniform(-1e-4, 1e-4, size=target.points.shape)
+    return source, target
+
+
+class Canceller:
+    """Requests cancel a fixed time after ``stage`` first reports progress."""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.event = threading.Event()
+        self.cancelled_at = None
+        self._timer = None
+
+    def progress(self, stage, fraction):
+        if stage == self.stage and self._timer is None:
+            self._timer = threading.Timer(CANCEL_AFTER_SECONDS, self._cancel)
+            self._timer.start()
+
+    def _cancel(self):
+        self.cancelled_at = time.perf_counter()
+        self.event.set()
+
+
+@pytest.mark.parametrize(
+    "stage, options",
+    [
+        ("query", {"engine": "vtk"}),
+        ("query", {"engine": "kdtree"}),
+        ("query", {"engine": "kdtree", "workers": 2}),
+        ("decimate_source", {"engine": "kdtree", "reduction": 0.9, "decimation_method": "quadric"}),
+    ],
+    ids=["vtk", "kdtree", "parallel", "decimation"],
+)
+def test_compute_distance_cancels_promptly(stage, options):
+    if options["engine"] == "kdtree":
+        pytest.importorskip("scipy")
+    source, target = large_pair(seed=len(options) * 10 + len(stage))
+    canceller = Canceller(stage)
+
+    with pytest.raises(DistanceComputationCancelled):
+        compute_distance(
+            source, target, abort_event=canceller.event.is_set, progress=canceller.progress, **options
+        )
+
+    assert canceller.cancelled_at is not None, f"{stage} finished before the cancel"
+    assert time.perf_counter() - canceller.cancelled_at < CANCEL_BOUND_SECONDS
+
+
+def test_cancel_while_another_run_holds_the_locator():
+    locator = _ImplicitDistance(pv.Sphere())
+    locator.lock.acquire()  # a long evaluation of another run
+    cancel = threading.Event()
+    outcome = {}
+
+    def run():
+        outcome["distances"] = locator.evaluate(make_queries(1000), cancel.is_set, 256)
+
+    waiter = threading.Thread(target=run)
+    waiter.start()
+    try:
+        time.sleep(CANCEL_AFTER_SECONDS)
+        assert waiter.is_alive()
+        started = time.perf_counter()
+        cancel.set()
+        waiter.join(CANCEL_BOUND_SECONDS)
+        assert not waiter.is_alive()
+        assert time.perf_counter() - started < CANCEL_BOUND_SECONDS
+        assert outcome["distances"] is None
+    finally:
+        locator.lock.release()
+        waiter.join()
+
+    # The locator stays usable once the other run is done.
+    assert locator.evaluate(make_queries(10), lambda: False, 256) is not None
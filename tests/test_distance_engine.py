@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+pytest.importorskip("pyvista")
+
+from app.services.distance_engine import (  # noqa: E402
+    TargetIndex,
+    query_distances,
+    squared_distance_to_triangles,
+)
+
+
+def brute_force(points, faces, queries):
+    best = np.full(len(queries), np.inf)
+    for face in faces:
+        a, b, c = (np.broadcast_to(points[i], queries.shape) for i in face)
+        best = np.minimum(best, squared_distance_to_triangles(queries, a, b, c))
+    return np.sqrt(best)
+
+
+def grid_patch(origin, size, cells, z):
+    xs = np.linspace(origin[0], origin[0] + size, cells + 1)
+    ys = np.linspace(origin[1], origin[1] + size, cells + 1)
+    gx, gy = np.meshgrid(xs, ys, indexing="ij")
+    points = np.column_stack([gx.ravel(), gy.ravel(), np.full(gx.size, z)])
+    ids = np.arange(gx.size).reshape(gx.shape)
+    a, b = ids[:-1, :-1].ravel(), ids[1:, :-1].ravel()
+    c, d = ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()
+    faces = np.concatenate([np.column_stack([a, b, c]), np.column_stack([a, c, d])])
+    return points, faces
+
+
+def height_field(rng, cells=12):
+    points, faces = grid_patch((0.0, 0.0), 20.0, cells, 0.0)
+    points[:, :2] += rng.uniform(-0.4, 0.4, size=(len(points), 2))
+    points[:, 2] = rng.uniform(-2.0, 2.0, size=len(points))
+    return points, faces
+
+
+def test_large_triangle_far_from_nearest_vertices():
+    # One big triangle whose corners are far away, next to a dense patch
+    # that owns every nearby vertex.
+    big = np.array([[-100.0, -100.0, 0.0], [200.0, -100.0, 0.0], [-100.0, 200.0, 0.0]])
+    patch_points, patch_faces = grid_patch((2.0, -5.0), 10.0, 20, 9.0)
+    points = np.concatenate([big, patch_points])
+    faces = np.concatenate([[[0, 1, 2]], patch_faces + len(big)])
+    index = TargetIndex(points, faces)
+
+    query = np.array([[0.0, 0.0, 0.5]])
+    np.testing.assert_allclose(query_distances(index, query), [0.5])
+    np.testing.assert_allclose(query_distances(index, query, max_distance=5.0), [0.5])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_queries_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    points, faces = height_field(rng)
+    # Drop a random subset of faces so some triangles become large holes' rims.
+    faces = faces[rng.random(len(faces)) > 0.2]
+    index = TargetIndex(points, faces)
+    queries = rng.uniform([-5, -5, -6], [25, 25, 6], size=(400, 3))
+
+    expected = brute_force(points, faces, queries)
+    np.testing.assert_allclose(query_distances(index, queries), expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bounded_matches_unbounded_below_cutoff(seed):
+    rng = np.random.default_rng(100 + seed)
+    points, faces = height_field(rng, cells=6)
+    index = TargetIndex(points, faces)
+    queries = rng.uniform([-10, -10, -10], [30, 30, 10], size=(500, 3))
+    max_distance = 3.0
+
+    unbounded = query_distances(index, queries)
+    bounded = query_distances(index, queries, max_distance=max_distance)
+    np.testing.assert_allclose(bounded, np.minimum(unbounded, max_distance), atol=1e-12)
+    assert np.any(unbounded < max_distance)
+    assert np.any(unbounded > max_distance)
+
+
+def test_matches_vtk_implicit_distance():
+    vtk = pytest.importorskip("vtk")
+    import pyvista as pv
+
+    rng = np.random.default_rng(7)
+    points, faces = height_field(rng)
+    mesh = pv.PolyData(points, np.column_stack([np.full(len(faces), 3), faces]).ravel())
+    implicit = vtk.vtkImplicitPolyDataDistance()
+    implicit.SetInput(mesh)
+    queries = rng.uniform([-5, -5, -6], [25, 25, 6], size=(200, 3))
+    expected = np.abs([implicit.EvaluateFunction(*query) for query in queries])
+
+    index = TargetIndex(points, faces)
+    np.testing.assert_allclose(query_distances(index, queries), expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("max_distance", [None, 0.05])
+def test_compute_distance_kdtree_matches_vtk(max_distance):
+    pytest.importorskip("vtk")
+    import pyvista as pv
+
+    from app.services import compute_distance
+
+    rng = np.random.default_rng(11)
+    source = pv.Icosphere(radius=0.55, nsub=4)
+    source.points += rng.normal(scale=0.01, size=source.points.shape)
+    target = pv.Icosphere(radius=0.5, nsub=3)
+    target.points += rng.normal(scale=0.01, size=target.points.shape)
+
+    kdtree, kdtree_min = compute_distance(
+        source, target, engine="kdtree", max_distance=max_distance
+    )
+    vtk_result, vtk_min = compute_distance(
+        source, target, engine="vtk", max_distance=max_distance
+    )
+    np.testing.assert_allclose(
+        kdtree.point_data["Distance"], vtk_result.point_data["Distance"], atol=1e-9
+    )
+    assert kdtree_min == pytest.approx(vtk_min, abs=1e-9)
@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pv = pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from app.services.isolation import compute_distance_isolated  # noqa: E402
+from app.services.mesh_ops import DistanceComputationCancelled  # noqa: E402
+
+PROC = Path("/proc")
+SHM = Path("/dev/shm")
+
+
+def descendants(pid):
+    """PIDs below ``pid``, ignoring multiprocessing's shared resource tracker."""
+    children = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            cmdline = (entry / "cmdline").read_bytes()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        if b"resource_tracker" not in cmdline:
+            children.setdefault(ppid, []).append(int(entry.name))
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+@pytest.mark.skipif(not PROC.is_dir() or not SHM.is_dir(), reason="needs /proc and /dev/shm")
+def test_cancel_leaves_no_processes_or_shared_memory():
+    source = pv.Sphere(theta_resolution=800, phi_resolution=800)
+    target = pv.Sphere(radius=0.6, theta_resolution=400, phi_resolution=400)
+    # Other tests may leave the shared KD-tree pool running.
+    processes = set(descendants(os.getpid()))
+    segments = set(os.listdir(SHM))
+    querying = threading.Event()
+
+    def progress(stage, fraction):
+        if stage == "query":
+            querying.set()
+
+    with pytest.raises(DistanceComputationCancelled):
+        compute_distance_isolated(
+            source,
+            target,
+            engine="kdtree",
+            workers=2,
+            abort_event=querying.is_set,
+            progress=progress,
+        )
+
+    deadline = time.monotonic() + 5.0
+    while set(descendants(os.getpid())) - processes and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert set(descendants(os.getpid())) - processes == set()
+    assert set(os.listdir(SHM)) - segments == set()
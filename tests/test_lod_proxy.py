@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services import mesh_ops  # noqa: E402
+from app.services.mesh_ops import build_lod_proxy, sample_point_scalars  # noqa: E402
+
+
+def nearest_values(mesh, points, values):
+    nearest = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), 256):
+        block = points[start:start + 256]
+        squared = ((block[:, None, :] - mesh.points[None, :, :]) ** 2).sum(axis=2)
+        nearest[start:start + 256] = squared.argmin(axis=1)
+    return values[nearest]
+
+
+def result_mesh():
+    mesh = pv.Icosphere(radius=1.0, nsub=5)
+    distances = mesh.points[:, 2] + 1.0
+    # Vertices left out of an ROI run.
+    distances[mesh.points[:, 0] > 0.8] = np.nan
+    mesh.point_data["Distance"] = distances
+    return mesh
+
+
+def test_small_meshes_get_no_proxy():
+    assert build_lod_proxy(result_mesh(), target_points=20000) is None
+
+
+def test_proxy_samples_point_distances_from_nearest_vertex():
+    mesh = result_mesh()
+    original = mesh.point_data["Distance"].copy()
+    decimations = mesh_ops._decimation_cache.stats()["entries"]
+
+    proxy = build_lod_proxy(mesh, target_points=2000)
+
+    assert 1000 < proxy.n_points < 3000
+    np.testing.assert_array_equal(
+        proxy.point_data["Distance"], nearest_values(mesh, proxy.points, original)
+    )
+    assert np.isnan(proxy.point_data["Distance"]).any()
+    np.testing.assert_array_equal(mesh.point_data["Distance"], original)
+    assert mesh_ops._decimation_cache.stats()["entries"] == decimations
+
+
+def test_proxy_samples_cell_distances_from_nearest_cell():
+    mesh = pv.Icosphere(radius=1.0, nsub=5)
+    centers = mesh.cell_centers()
+    mesh.cell_data["Distance"] = centers.points[:, 2] + 1.0
+
+    proxy = build_lod_proxy(mesh, target_points=2000)
+
+    assert "Distance" not in proxy.point_data
+    np.testing.assert_array_equal(
+        proxy.cell_data["Distance"],
+        nearest_values(centers, proxy.cell_centers().points, mesh.cell_data["Distance"]),
+    )
+
+
+def test_sample_point_scalars_picks_nearest_vertex():
+    mesh = pv.PolyData(np.array([[0.0, 0, 0], [1.0, 0, 0], [0, 1.0, 0]]))
+    mesh.point_data["Distance"] = np.array([1.0, 2.0, 3.0])
+    points = np.array([[0.1, 0.1, 0], [0.9, 0.2, 0], [0.2, 0.7, 0]])
+    np.testing.assert_array_equal(sample_point_scalars(mesh, points, "Distance"), [1.0, 2.0, 3.0])
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyvista")
+
+from app.services import cache  # noqa: E402
+from app.services.cache import MappedArrayCache  # noqa: E402
+
+
+@pytest.fixture
+def mapped_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    return MappedArrayCache("meshes-test", max_bytes=1 << 20)
+
+
+def entry_names(mapped_cache):
+    return sorted(path.name for path in mapped_cache.directory.iterdir())
+
+
+def test_store_again_keeps_mapped_version_and_loads_newest(mapped_cache):
+    mapped_cache.store("key", {"points": np.arange(6.0)})
+    mapped = mapped_cache.load("key")
+    mapped_cache.store("key", {"points": np.arange(3.0)})
+
+    np.testing.assert_array_equal(mapped_cache.load("key")["points"], np.arange(3.0))
+    # The first version is still readable through its maps.
+    np.testing.assert_array_equal(mapped["points"], np.arange(6.0))
+    assert len(entry_names(mapped_cache)) == 1
+
+
+def test_unreadable_entry_is_removed(mapped_cache):
+    mapped_cache.store("key", {"points": np.arange(6.0), "faces": np.arange(4)})
+    (entry,) = mapped_cache.directory.iterdir()
+    (entry / "1.npy").unlink()
+
+    assert mapped_cache.load("key") is None
+    assert entry_names(mapped_cache) == []
+
+
+def test_prune_keeps_entries_in_use(mapped_cache, monkeypatch):
+    mapped_cache.store("busy", {"points": np.zeros(60_000)})
+    rename = Path.rename
+
+    def locked_rename(path, target):
+        # What Windows does while a mesh maps the entry's files.
+        if path.name.startswith("busy.") and str(target).endswith(".trash"):
+            raise PermissionError(13, "in use", str(path))
+        return rename(path, target)
+
+    monkeypatch.setattr(Path, "rename", locked_rename)
+    for key in ("first", "second"):
+        mapped_cache.store(key, {"points": np.zeros(60_000)})
+
+    assert mapped_cache.load("busy") is not None
+    assert mapped_cache.load("first") is None
+    assert mapped_cache.load("second") is not None
+    assert mapped_cache.stats()["evictions"] == 1
+    assert not [name for name in entry_names(mapped_cache) if name.startswith(".")]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services.mesh_ops import compute_distance  # noqa: E402
+
+
+@pytest.mark.parametrize("method", ["quadric", "clustering"])
+def test_decimation_reports_intermediate_progress(method):
+    rng = np.random.default_rng(21)
+    # Jittered so no other test has put these meshes in the decimation cache.
+    source = pv.Icosphere(radius=0.55, nsub=6)
+    source.points += rng.uniform(-1e-5, 1e-5, size=source.points.shape)
+    target = pv.Icosphere(radius=0.5, nsub=6)
+    target.points += rng.uniform(-1e-5, 1e-5, size=target.points.shape)
+    reports = {}
+
+    compute_distance(
+        source,
+        target,
+        reduction=0.8,
+        decimation_method=method,
+        progress=lambda stage, fraction: reports.setdefault(stage, []).append(fraction),
+    )
+
+    for stage in ("decimate_source", "decimate_target"):
+        fractions = reports[stage]
+        assert fractions[0] == 0.0 and fractions[-1] == 1.0
+        assert any(0.0 < fraction < 1.0 for fraction in fractions)
+        assert fractions == sorted(fractions)
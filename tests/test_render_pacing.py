@@ -0,0 +1,45 @@
+import pytest
+
+from app.ui.render_pacing import FrameCoalescer
+
+FRAME = 1.0 / 60.0
+
+
+def test_requests_within_a_frame_share_it():
+    frames = FrameCoalescer(FRAME)
+    calls = []
+
+    assert frames.request(["left", "right"], calls.append, now=0.0) == 0.0
+    assert frames.request(["left"], now=0.001) is None
+    prepare, plotters = frames.take_frame(now=0.002)
+
+    assert plotters == ["left", "right"]
+    assert prepare == [calls.append]
+    assert frames.stats()["coalesced"] == 1
+    assert frames.stats()["frames"] == 1
+
+
+def test_next_frame_waits_for_the_frame_interval():
+    frames = FrameCoalescer(FRAME)
+    frames.request(["view"], now=0.0)
+    frames.take_frame(now=0.0)
+
+    assert frames.request(["view"], now=0.005) == pytest.approx(FRAME - 0.005)
+    assert frames.take_frame(now=FRAME)[1] == ["view"]
+    assert frames.stats()["dropped"] == 0
+
+
+def test_late_frames_count_dropped_slots():
+    frames = FrameCoalescer(FRAME)
+    frames.request(["view"], now=0.0)
+    frames.take_frame(now=3.5 * FRAME)
+
+    assert frames.stats()["dropped"] == 3
+
+
+def test_forgotten_plotters_are_not_drawn():
+    frames = FrameCoalescer(FRAME)
+    frames.request(["open", "closed"], now=0.0)
+    frames.forget("closed")
+
+    assert frames.take_frame(now=0.0)[1] == ["open"]
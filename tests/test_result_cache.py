@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services import cache, mesh_ops  # noqa: E402
+from app.services.mesh_ops import compute_distance  # noqa: E402
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+def make_pair():
+    source = pv.Sphere(radius=0.55, theta_resolution=40, phi_resolution=40)
+    # Cell centres sit closer to the target than the vertices around them.
+    target = pv.Sphere(radius=0.5, theta_resolution=30, phi_resolution=30)
+    return source, target
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"engine": "vtk"}, {"engine": "kdtree"}, {"engine": "vtk", "max_distance": 0.06}],
+    ids=["vtk", "kdtree", "bounded"],
+)
+def test_cache_hit_matches_fresh_result(cache_dir, options):
+    if options["engine"] == "kdtree":
+        pytest.importorskip("scipy")
+    source, target = make_pair()
+
+    fresh, fresh_min = compute_distance(source, target, **options)
+    assert list(cache_dir.rglob("*.npz"))
+    cached, cached_min = compute_distance(source, target, **options)
+
+    assert cached_min == fresh_min
+    assert fresh_min == pytest.approx(float(fresh.point_data["Distance"].min()))
+    for association in ("point_data", "cell_data"):
+        fresh_arrays = getattr(fresh, association)
+        cached_arrays = getattr(cached, association)
+        assert set(cached_arrays.keys()) == set(fresh_arrays.keys())
+        for name in fresh_arrays.keys():
+            np.testing.assert_array_equal(cached_arrays[name], fresh_arrays[name])
+            assert cached_arrays[name].dtype == fresh_arrays[name].dtype
+
+
+@pytest.mark.parametrize("engine", ["vtk", "kdtree"])
+def test_bounded_matches_unbounded_below_cutoff(engine):
+    if engine == "kdtree":
+        pytest.importorskip("scipy")
+    source, target = make_pair()
+    max_distance = 0.06
+
+    full, full_min = compute_distance(source, target, engine=engine)
+    bounded, bounded_min = compute_distance(
+        source, target, engine=engine, max_distance=max_distance
+    )
+
+    assert bounded_min == full_min
+    for association in ("point_data", "cell_data"):
+        full_arrays = getattr(full, association)
+        bounded_arrays = getattr(bounded, association)
+        assert ("Distance" in bounded_arrays) == ("Distance" in full_arrays)
+        if "Distance" in full_arrays:
+            np.testing.assert_allclose(
+                bounded_arrays["Distance"],
+                np.minimum(full_arrays["Distance"], max_distance),
+                atol=1e-12,
+            )
+
+
+def test_uncached_run_stores_nothing(cache_dir):
+    source, target = make_pair()
+    options = {"target_points": 500, "decimation_method": "clustering"}
+    decimations = mesh_ops._decimation_cache.stats()["entries"]
+
+    uncached, uncached_min = compute_distance(source, target, cache=False, **options)
+    assert not [path for path in cache_dir.rglob("*") if path.is_file()]
+    assert mesh_ops._decimation_cache.stats()["entries"] == decimations
+
+    cached, cached_min = compute_distance(source, target, **options)
+    assert list((cache_dir / "decimation").glob("*.npz"))
+    assert list((cache_dir / "distance").glob("*.npz"))
+    assert cached_min == uncached_min
+    np.testing.assert_array_equal(cached.point_data["Distance"], uncached.point_data["Distance"])
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services.mesh_ops import (  # noqa: E402
+    replace_distance_scalars,
+    same_geometry,
+    shared_copy,
+)
+
+
+def result(values=0.0, assoc="point"):
+    mesh = pv.Icosphere(radius=1.0, nsub=3)
+    data = mesh.point_data if assoc == "point" else mesh.cell_data
+    size = mesh.n_points if assoc == "point" else mesh.n_cells
+    data["Distance"] = np.full(size, values)
+    return mesh
+
+
+def test_same_geometry_for_shared_and_deep_copies():
+    mesh = result()
+    assert same_geometry(mesh, mesh)
+    assert same_geometry(mesh, shared_copy(mesh))
+    assert same_geometry(mesh, mesh.copy())
+
+
+def test_same_geometry_detects_changes():
+    mesh = result()
+    moved = mesh.copy()
+    moved.points[7] += 1e-6
+    assert not same_geometry(mesh, moved)
+
+    rewired = mesh.copy()
+    faces = rewired.faces.reshape(-1, 4).copy()
+    faces[0, 1:] = faces[0, [2, 3, 1]]
+    rewired.faces = faces.ravel()
+    assert not same_geometry(mesh, rewired)
+
+    assert not same_geometry(mesh, pv.Icosphere(radius=1.0, nsub=2))
+    assert not same_geometry(mesh, pv.ImageData(dimensions=(3, 3, 3)))
+
+
+@pytest.mark.parametrize("assoc", ["point", "cell"])
+def test_distances_are_replaced_in_place(assoc):
+    previous = result(1.0, assoc)
+    displayed = shared_copy(previous)
+    displayed.set_active_scalars("Distance", preference=assoc)
+    buffers = previous.points, previous.faces
+    new = result(2.0, assoc)
+    stamp = displayed.GetMTime()
+
+    assert replace_distance_scalars(displayed, previous, new)
+
+    data = displayed.point_data if assoc == "point" else displayed.cell_data
+    np.testing.assert_array_equal(data["Distance"], 2.0)
+    assert displayed.active_scalars_name == "Distance"
+    assert displayed.GetMTime() > stamp
+    assert np.shares_memory(displayed.points, buffers[0])
+    np.testing.assert_array_equal(displayed.faces, buffers[1])
+
+
+def test_incompatible_results_leave_the_display_alone():
+    previous = result(1.0)
+    displayed = shared_copy(previous)
+
+    moved = result(2.0)
+    moved.points[0] += 0.1
+    assert not replace_distance_scalars(displayed, previous, moved)
+    assert not replace_distance_scalars(displayed, previous, result(2.0, "cell"))
+    assert not replace_distance_scalars(displayed, previous, pv.Icosphere(radius=1.0, nsub=3))
+
+    bare = pv.Icosphere(radius=1.0, nsub=3)
+    assert not replace_distance_scalars(bare, previous, result(2.0))
+    np.testing.assert_array_equal(displayed.point_data["Distance"], 1.0)
@@ -0,0 +1,81 @@
+import pytest
+
+from app.ui.session_rendering import resume_session, suspend_session
+
+
+class FakeRenderWindow:
+    def __init__(self, fail=False):
+        self.released = 0
+        self.fail = fail
+
+    def ReleaseGraphicsResources(self, window):
+        assert window is self
+        if self.fail:
+            raise RuntimeError("no context")
+        self.released += 1
+
+
+class FakePlotter:
+    def __init__(self, render_window=None):
+        self.suppress_rendering = False
+        self.render_window = render_window
+        self.renders = 0
+
+    def render(self):
+        if not self.suppress_rendering:
+            self.renders += 1
+
+
+def session(render_window=None):
+    return {'plotter': FakePlotter(render_window)}
+
+
+@pytest.mark.parametrize("release", [False, True])
+def test_suspend_resume_round_trip(release):
+    window = FakeRenderWindow()
+    hidden = session(window)
+    plotter = hidden['plotter']
+
+    assert suspend_session(hidden, release=release) is release
+    assert hidden['suspended'] and plotter.suppress_rendering
+    plotter.render()
+    assert plotter.renders == 0
+
+    # Hiding an already hidden tab again releases nothing twice.
+    assert not suspend_session(hidden, release=release)
+    assert window.released == int(release)
+
+    resume_session(hidden)
+    assert not hidden['suspended'] and not hidden['released']
+    assert not plotter.suppress_rendering
+    assert plotter.renders == 1
+
+    resume_session(hidden)
+    assert plotter.renders == 1
+
+    # After a resume the resources can be released again.
+    assert suspend_session(hidden, release=release) is release
+    assert window.released == 2 * int(release)
+
+
+def test_release_enabled_after_suspending():
+    window = FakeRenderWindow()
+    hidden = session(window)
+    assert not suspend_session(hidden)
+    assert suspend_session(hidden, release=True)
+    assert window.released == 1
+
+
+def test_failed_release_keeps_the_session_suspended():
+    for hidden in (session(), session(FakeRenderWindow(fail=True))):
+        assert not suspend_session(hidden, release=True)
+        assert hidden['suspended'] and not hidden.get('released')
+        assert hidden['plotter'].suppress_rendering
+        resume_session(hidden)
+        assert hidden['plotter'].renders == 1
+
+
+def test_resume_of_visible_session_does_not_render():
+    visible = session(FakeRenderWindow())
+    resume_session(visible)
+    assert visible['plotter'].renders == 0
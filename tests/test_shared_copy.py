@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services.mesh_ops import mesh_buffers, shared_copy  # noqa: E402
+
+
+def surface():
+    mesh = pv.Icosphere(radius=1.0, nsub=3)
+    mesh.point_data["Distance"] = np.linspace(0.0, 1.0, mesh.n_points)
+    mesh.cell_data["Region"] = np.arange(mesh.n_cells)
+    return mesh
+
+
+def test_copy_shares_every_buffer():
+    mesh = surface()
+    copy = shared_copy(mesh)
+
+    assert mesh_buffers(copy) == mesh_buffers(mesh)
+    assert np.shares_memory(copy.points, mesh.points)
+    assert np.shares_memory(copy.point_data["Distance"], mesh.point_data["Distance"])
+    # points, polys offsets and connectivity, one point and one cell array
+    assert len(mesh_buffers(mesh)) == 5
+
+
+def test_replacing_data_on_the_copy_leaves_the_original_alone():
+    mesh = surface()
+    points = mesh.points.copy()
+    faces = mesh.faces.copy()
+    copy = shared_copy(mesh)
+
+    copy.points = points * 2.0
+    copy.faces = faces[:4]
+    copy.point_data["Distance"] = np.zeros(copy.n_points)
+    copy.point_data["Extra"] = np.ones(copy.n_points)
+    copy.cell_data.remove("Region")
+    copy.set_active_scalars("Extra")
+
+    np.testing.assert_array_equal(mesh.points, points)
+    np.testing.assert_array_equal(mesh.faces, faces)
+    np.testing.assert_array_equal(
+        mesh.point_data["Distance"], np.linspace(0.0, 1.0, mesh.n_points)
+    )
+    assert "Extra" not in mesh.point_data
+    assert "Region" in mesh.cell_data
+    assert mesh.point_data.active_scalars_name != "Extra"
+
+
+def test_deep_copy_has_its_own_buffers():
+    mesh = surface()
+    assert not set(mesh_buffers(mesh.copy())) & set(mesh_buffers(mesh))
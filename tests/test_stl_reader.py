@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from app.services.mesh_ops import read_binary_stl  # noqa: E402
+
+
+def write_stl(path, corners):
+    corners = np.asarray(corners, dtype="<f4").reshape(-1, 3, 3)
+    dtype = [("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+    records = np.zeros(len(corners), dtype=dtype)
+    records["vertices"] = corners
+    with open(path, "wb") as handle:
+        handle.write(b"\0" * 80)
+        handle.write(np.uint32(len(corners)).tobytes())
+        handle.write(records.tobytes())
+
+
+def test_matches_vtk_stl_reader(tmp_path):
+    rng = np.random.default_rng(3)
+    mesh = pv.Icosphere(radius=5.0, nsub=4)
+    mesh.points += rng.normal(scale=0.01, size=mesh.points.shape)
+    path = str(tmp_path / "scan.stl")
+    mesh.save(path, binary=True)
+
+    expected = pv.read(path)
+    result = read_binary_stl(path)
+    np.testing.assert_array_equal(result.points, expected.points)
+    np.testing.assert_array_equal(result.faces, expected.faces)
+
+
+def test_welds_exact_corners_only(tmp_path):
+    # The second triangle shares x and y with the first one's corners but
+    # not z, the third repeats a corner as -0.0, the last collapses.
+    corners = [
+        [[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+        [[0, 0, 1], [1, 0, 1], [0, 1, 1]],
+        [[-0.0, 0, 0], [1, 0, 0], [1, 1, 0]],
+        [[1, 1, 0], [1, 1, 0], [0, 1, 0]],
+    ]
+    path = str(tmp_path / "ties.stl")
+    write_stl(path, corners)
+
+    result = read_binary_stl(path)
+    np.testing.assert_array_equal(
+        result.points,
+        [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 0]],
+    )
+    np.testing.assert_array_equal(result.regular_faces, [[0, 1, 2], [3, 4, 5], [0, 1, 6]])
+
+
+def test_other_files_are_left_to_pyvista(tmp_path):
+    path = tmp_path / "ascii.stl"
+    path.write_text("solid empty\nendsolid empty\n")
+    assert read_binary_stl(str(path)) is None
@@ -0,0 +1,68 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from app.services import distance_engine  # noqa: E402
+from app.services.distance_engine import (  # noqa: E402
+    TargetIndex,
+    compute_point_distances,
+    compute_point_distances_parallel,
+    triangle_arrays,
+)
+
+PROC = Path("/proc")
+
+
+def make_job():
+    target = pv.Icosphere(radius=0.5, nsub=4)
+    points, faces = triangle_arrays(target)
+    queries = pv.Icosphere(radius=0.55, nsub=4).points
+    expected = compute_point_distances(TargetIndex(points, faces), queries)
+    return points, faces, queries, expected
+
+
+def mapped_segments(pid):
+    """Shared-memory segments mapped by ``pid`` and its descendants."""
+    children = {}
+    for entry in PROC.iterdir():
+        if entry.name.isdigit():
+            try:
+                stat = (entry / "stat").read_text()
+            except OSError:
+                continue
+            children.setdefault(int(stat.rsplit(")", 1)[1].split()[1]), []).append(entry.name)
+    found, stack = set(), [str(pid)]
+    while stack:
+        current = stack.pop()
+        try:
+            maps = (PROC / current / "maps").read_text()
+        except OSError:
+            maps = ""
+        found.update(line.split(None, 5)[-1] for line in maps.splitlines() if "/dev/shm/" in line)
+        stack.extend(children.get(int(current), ()))
+    return found
+
+
+def test_broken_pool_is_replaced():
+    points, faces, queries, expected = make_job()
+    with pytest.raises(BrokenProcessPool):
+        distance_engine._shared_pool(2).submit(os._exit, 1).result()
+
+    distances = compute_point_distances_parallel(points, faces, queries, workers=2, chunk_size=512)
+    np.testing.assert_array_equal(distances, expected)
+
+
+@pytest.mark.skipif(not PROC.is_dir(), reason="needs /proc")
+def test_workers_release_job_segments():
+    points, faces, queries, expected = make_job()
+    before = mapped_segments(os.getpid())
+
+    distances = compute_point_distances_parallel(points, faces, queries, workers=2, chunk_size=512)
+    np.testing.assert_array_equal(distances, expected)
+    assert mapped_segments(os.getpid()) - before == set()